@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+"""
+This module defines the 'QuakesIndex' class to find the earthquakes loaded by the
+'EarthquakesPlotter' class around a point or inside a region, without scanning all of them.
+
+The class allows to:
+- Bucket the epicenters in a latitude/longitude grid, sorted so each grid row is contiguous.
+- Find the earthquakes within a distance of a point, measured on the sphere.
+- Find the earthquakes inside a polygon or a bounding box.
+- Return the positions of the earthquakes, ready to select the rows of a dataframe.
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+EARTH_RADIUS_KM: float = 6371.0088
+CELL_SIZE: float = 1.0
+
+
+def _gather(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Return the concatenation of the ranges [start, end) in one vectorized step."""
+    lengths: np.ndarray = np.maximum(ends - starts, 0)
+    offsets: np.ndarray = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return np.arange(lengths.sum()) + offsets
+
+
+def haversine_km(lats: np.ndarray, longs: np.ndarray, lat: float, long: float) -> np.ndarray:
+    """Return the great-circle distances in km between the points and a point, in degrees."""
+    lats_rad: np.ndarray = np.radians(lats)
+    lat_rad: float = np.radians(lat)
+    half_dlat: np.ndarray = (lats_rad - lat_rad) / 2
+    half_dlong: np.ndarray = np.radians(longs - long) / 2
+    chord: np.ndarray = np.sin(half_dlat) ** 2 + np.cos(lats_rad) * np.cos(lat_rad) * np.sin(half_dlong) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(chord, 0, 1)))
+
+
+class QuakesIndex:
+    """Answer radius and region queries over the epicenters of the earthquakes."""
+
+    def __init__(self, lats: np.ndarray, longs: np.ndarray, cell_size: float = CELL_SIZE) -> None:
+        """Build the grid of the epicenters, with cells of cell_size degrees."""
+        self.lats: np.ndarray = np.asarray(lats, dtype=np.float64)
+        self.longs: np.ndarray = np.asarray(longs, dtype=np.float64)
+        self.cell_size = cell_size
+        self.n_rows: int = int(np.ceil(180 / cell_size))
+        self.n_cols: int = int(np.ceil(360 / cell_size))
+
+        # The positions of the earthquakes sorted by cell, and where each cell starts.
+        cells: np.ndarray = self._rows(self.lats) * self.n_cols + self._cols(self.longs)
+        self.order: np.ndarray = np.argsort(cells, kind="stable")
+        self.cell_starts: np.ndarray = np.searchsorted(cells[self.order], np.arange(self.n_rows * self.n_cols + 1))
+
+    def within_radius(self, lat: float, long: float, radius_km: float) -> np.ndarray:
+        """Return the positions of the earthquakes within radius_km of the point, in order."""
+        angle: float = radius_km / EARTH_RADIUS_KM
+        min_lat: float = lat - np.degrees(angle)
+        max_lat: float = lat + np.degrees(angle)
+
+        # The widest longitude span of the circle, unless it covers a pole.
+        long_ratio: float = np.sin(min(angle, np.pi / 2)) / np.cos(np.radians(lat))
+        if min_lat <= -90 or max_lat >= 90 or long_ratio >= 1:
+            min_long, max_long = -180.0, 180.0
+        else:
+            span: float = np.degrees(np.arcsin(long_ratio))
+            min_long, max_long = long - span, long + span
+
+        candidates: np.ndarray = self._candidates(min_lat, max_lat, min_long, max_long)
+        distances: np.ndarray = haversine_km(self.lats[candidates], self.longs[candidates], lat, long)
+        return np.sort(candidates[distances <= radius_km])
+
+    def within_bbox(self, min_long: float, min_lat: float, max_long: float, max_lat: float) -> np.ndarray:
+        """
+        Return the positions of the earthquakes in the bounding box, in order.
+        The box crosses the antimeridian if min_long > max_long, as the GeoJSON bbox.
+        """
+        if min_long > max_long:
+            max_long += 360
+        candidates: np.ndarray = self._candidates(min_lat, max_lat, min_long, max_long)
+        in_lats: np.ndarray = (self.lats[candidates] >= min_lat) & (self.lats[candidates] <= max_lat)
+        shifted_longs: np.ndarray = (self.longs[candidates] - min_long) % 360
+        in_longs: np.ndarray = shifted_longs <= max_long - min_long
+        return np.sort(candidates[in_lats & in_longs])
+
+    def within_polygon(self, polygon: Sequence[tuple[float, float]]) -> np.ndarray:  # pylint: disable=R0914
+        """
+        Return the positions of the earthquakes inside the polygon of (longitude, latitude)
+        vertices, in order. The polygon must not cross the antimeridian.
+        """
+        vertices: np.ndarray = np.asarray(polygon, dtype=np.float64)
+        vertex_longs: np.ndarray = vertices[:, 0]
+        vertex_lats: np.ndarray = vertices[:, 1]
+        candidates: np.ndarray = self._candidates(
+            vertex_lats.min(), vertex_lats.max(), vertex_longs.min(), vertex_longs.max()
+        )
+        longs: np.ndarray = self.longs[candidates]
+        lats: np.ndarray = self.lats[candidates]
+
+        # Count the edges crossed by a ray going east of each point: inside if odd.
+        inside: np.ndarray = np.zeros(len(candidates), dtype=bool)
+        for start in range(len(vertices)):
+            long_a, lat_a = vertex_longs[start - 1], vertex_lats[start - 1]
+            long_b, lat_b = vertex_longs[start], vertex_lats[start]
+            if lat_a == lat_b:
+                continue
+            spans: np.ndarray = (lat_a > lats) != (lat_b > lats)
+            crossing_longs: np.ndarray = long_a + (lats - lat_a) * (long_b - long_a) / (lat_b - lat_a)
+            inside ^= spans & (longs < crossing_longs)
+        return np.sort(candidates[inside])
+
+    def _rows(self, lats: np.ndarray) -> np.ndarray:
+        """Return the grid rows of the latitudes."""
+        return np.clip(np.floor((lats + 90) / self.cell_size), 0, self.n_rows - 1).astype(np.int64)
+
+    def _cols(self, longs: np.ndarray) -> np.ndarray:
+        """Return the grid columns of the longitudes, wrapped around the antimeridian."""
+        return np.clip(np.floor(((longs + 180) % 360) / self.cell_size), 0, self.n_cols - 1).astype(np.int64)
+
+    def _candidates(self, min_lat: float, max_lat: float, min_long: float, max_long: float) -> np.ndarray:
+        """
+        Return the positions of the earthquakes in the cells overlapping the box.
+        The longitudes may go past ±180, the box then wraps around the antimeridian.
+        """
+        rows: np.ndarray = np.arange(
+            int(self._rows(np.array(max(min_lat, -90.0)))[()]), int(self._rows(np.array(min(max_lat, 90.0)))[()]) + 1
+        )
+        col_ranges: list[tuple[int, int]] = []
+        if max_long - min_long >= 360:
+            col_ranges.append((0, self.n_cols - 1))
+        else:
+            first_col: int = int(self._cols(np.array(min_long))[()])
+            last_col: int = int(self._cols(np.array(max_long))[()])
+            if first_col <= last_col:
+                col_ranges.append((first_col, last_col))
+            else:
+                col_ranges.extend([(first_col, self.n_cols - 1), (0, last_col)])
+
+        # The cells of a row are contiguous in the sorted order, so each range is a slice.
+        starts: np.ndarray = np.concatenate([self.cell_starts[rows * self.n_cols + first] for first, _ in col_ranges])
+        ends: np.ndarray = np.concatenate([self.cell_starts[rows * self.n_cols + last + 1] for _, last in col_ranges])
+        return self.order[_gather(starts, ends)]
@@ -5,63 +5,233 @@ This module defines the 'EarthquakesPlotter' class to analyze, plot and visualiz
 earthquakes activity using Plotly.
 
 The class allows to:
-- Import the earthquake data from GeoJSON files.
-- Extract and handle magnitude, longitude, latitude, event title, and date of the quake.
+- Import the earthquake data from GeoJSON files, parsing the features one at a time.
+- Write a readable copy of the GeoJSON file feature by feature while it's parsed.
+- Extract magnitude, longitude, latitude, event title, and date of the quakes into typed columns.
+- Filter the quakes by magnitude, time window and bounding box while parsing them.
+- Select the quakes around a point or inside a polygon with a spatial index.
+- Merge overlapping feeds in a local store, processing only the new or updated quakes.
 - The cass also handles data formatting and customization of the plot title.
 - Generate and customize a geographical plot to visualize the data.
+- Aggregate the quakes in a grid of cells when there are too many to plot as markers.
+- Export the figures as compact HTML or JSON files, with the numeric data as typed arrays.
 """
 
 import sys
 from pathlib import Path
 import json
-from datetime import datetime, timezone
+from array import array
+from contextlib import AbstractContextManager, contextmanager, nullcontext
 import logging
-from typing import Any, Union, Optional
+from datetime import datetime
+from typing import Any, Optional, Iterator, Sequence, TextIO, TypedDict, Union
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 from plotly.graph_objects import Figure
 
+from quakes_index import QuakesIndex
+from quakes_store import QuakesStore, quake_fields
+
+# figure_export is shared with the wildfires project, it's imported from the parent directory.
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import figure_export  # pylint: disable=C0413,C0411,E0401
+
 logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s")
 
+CHUNK_SIZE: int = 65_536
+WHITESPACE: str = " \t\n\r"
+READABLE_INDENT: str = " " * 4
+DATE_FORMAT: str = "%B %d, %Y -- %H:%M:%S %Z (24-Hour format)"
+TITLE_DATE_FORMAT: str = "%B %Y"
+# The date format of the hover labels, applied by plotly.js to the times of the quakes.
+HOVER_DATE_FORMAT: str = "%B %d, %Y -- %H:%M:%S UTC (24-Hour format)"
+# Past this number of earthquakes, they are plotted as grid cells instead of markers.
+MAX_MARKERS: int = 50_000
+AGGREGATE_CELL_SIZE: float = 1.0
+TimeBound = Union[str, datetime, pd.Timestamp]
+BoundingBox = tuple[float, float, float, float]
+
+
+class QuakeFilter(TypedDict):
+    """A TypedDict describing the ranges the earthquakes must be in to be extracted."""
+
+    min_mag: float
+    max_mag: float
+    # Epoch milliseconds, as the times of the features.
+    start_time: float
+    end_time: float
+    # (min longitude, min latitude, max longitude, max latitude), as the GeoJSON bbox.
+    bbox: Optional[BoundingBox]
+
+
+class _JsonStream:
+    """Read JSON values one at a time from a text file, keeping only a chunk of it in memory."""
+
+    def __init__(self, json_file: TextIO, chunk_size: int = CHUNK_SIZE) -> None:
+        """Initialize the stream attributes."""
+        self.json_file = json_file
+        self.chunk_size = chunk_size
+        self.decoder: json.JSONDecoder = json.JSONDecoder()
+        self.buffer: str = ""
+        self.pos: int = 0
+        self.eof: bool = False
+
+    def _fill(self) -> bool:
+        """Read the next chunk, dropping the part of the buffer already parsed."""
+        chunk: str = self.json_file.read(self.chunk_size)
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        self.eof = not chunk
+        return not self.eof
+
+    def peek_char(self) -> str:
+        """Return the next character that isn't whitespace, without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of the GeoJSON file.")
+
+    def next_char(self, expected: str = "") -> str:
+        """Consume the next character that isn't whitespace. Raise ValueError if it's unexpected."""
+        char: str = self.peek_char()
+        if expected and char not in expected:
+            raise ValueError(f"Expected one of {expected!r} in the GeoJSON file, found {char!r}.")
+        self.pos += 1
+        return char
+
+    def decode_value(self) -> Any:
+        """Decode the next JSON value, reading more chunks until it's complete."""
+        self.peek_char()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk.
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+class _ReadableWriter:
+    """Write a JSON object member by member, laid out as json.dumps(..., indent=4) would."""
+
+    def __init__(self, readable_file: TextIO) -> None:
+        """Initialize the writer attributes."""
+        self.readable_file = readable_file
+        self.members: int = 0
+        self.items: int = 0
+
+    def member(self, key: str, value: Any) -> None:
+        """Write a member of the object."""
+        self._key(key)
+        self.readable_file.write(_indented(value, 1))
+
+    def begin_array(self, key: str) -> None:
+        """Write the key of an array member, whose items are written one at a time."""
+        self._key(key)
+        self.readable_file.write("[")
+        self.items = 0
+
+    def item(self, value: Any) -> None:
+        """Write an item of the array member."""
+        self.readable_file.write(",\n" if self.items else "\n")
+        self.readable_file.write(READABLE_INDENT * 2 + _indented(value, 2))
+        self.items += 1
+
+    def end_array(self) -> None:
+        """Close the array member."""
+        self.readable_file.write(f"\n{READABLE_INDENT}]" if self.items else "]")
+
+    def close(self) -> None:
+        """Close the object."""
+        self.readable_file.write("\n}" if self.members else "{}")
+
+    def _key(self, key: str) -> None:
+        """Write the key of a member, after the previous member."""
+        self.readable_file.write(",\n" if self.members else "{\n")
+        self.readable_file.write(f"{READABLE_INDENT}{json.dumps(key)}: ")
+        self.members += 1
+
 
 class EarthquakesPlotter:  # pylint: disable=R0902
     """Analyze and visualize earthquakes activity."""
 
-    def __init__(self, path: Path) -> None:
-        """Initialize the class attributes."""
+    def __init__(self, path: Path, store_path: Optional[Path] = None) -> None:
+        """
+        Initialize the class attributes. If a store_path is given, the feed is merged in the
+        store there and the quakes of all the feeds merged so far are analyzed.
+        """
         self.path = path
+        self.quakes_store: Optional[QuakesStore] = None if store_path is None else QuakesStore(store_path)
         self._data_attributes()
         self._data_lists()
         self.dataframe: pd.DataFrame = pd.DataFrame()
+        self._quakes_index: Optional[QuakesIndex] = None
 
     def _data_attributes(self) -> None:
         """Initialize the data attributes."""
         self.quakes_data: dict[str, Any] = {}
-        self.mag: Union[float, int] = 0.0
-        self.long: float = 0.0
-        self.lat: float = 0.0
-        self.timestamp_seconds: float = 0.0
-        self.event_title: str = ""
-        self.date: str = ""
-        self.title_date: str = ""
         self.formatted_plot_title: str = ""
+        self.quake_filter: QuakeFilter = self._make_filter()
 
     def _data_lists(self) -> None:
-        """Initialize the lists to store the desired data."""
-        self.mags: list[Union[float, int]] = []
-        self.longs: list[float] = []
-        self.lats: list[float] = []
-        self.event_titles: list[str] = []
-        self.event_dates: list[str] = []
+        """Initialize the columns to store the desired data."""
+        self.mags: np.ndarray = np.empty(0)
+        self.longs: np.ndarray = np.empty(0)
+        self.lats: np.ndarray = np.empty(0)
+        self.times: np.ndarray = np.empty(0, dtype="datetime64[ms]")
+        self.event_titles: np.ndarray = np.empty(0, dtype=object)
+        self.event_dates: np.ndarray = np.empty(0, dtype=object)
         self.title_dates: list[str] = []
 
-    def analyze_data(self, reformat_path: Optional[Path] = None) -> None:
-        """Main method to analyze the earthquakes data."""
+    def analyze_data(  # pylint: disable=R0913
+        self,
+        reformat_path: Optional[Path] = None,
+        min_mag: Optional[float] = None,
+        max_mag: Optional[float] = None,
+        start_time: Optional[TimeBound] = None,
+        end_time: Optional[TimeBound] = None,
+        bbox: Optional[BoundingBox] = None,
+    ) -> None:
+        """
+        Main method to analyze the earthquakes data.
+
+        Only the earthquakes with a magnitude between min_mag and max_mag, a time between
+        start_time and end_time (UTC if not given) and an epicenter in the bbox are extracted;
+        the others are skipped while the file is parsed. The bbox is (min longitude, min latitude,
+        max longitude, max latitude), and crosses the antimeridian if min longitude > max longitude.
+        """
+        self.quake_filter = self._make_filter(min_mag, max_mag, start_time, end_time, bbox)  # pylint: disable=W0201
         self._read_text(reformat_path)
         self._extract_data()
         self._quakes_dataframe()
 
+    @staticmethod
+    def _make_filter(
+        min_mag: Optional[float] = None,
+        max_mag: Optional[float] = None,
+        start_time: Optional[TimeBound] = None,
+        end_time: Optional[TimeBound] = None,
+        bbox: Optional[BoundingBox] = None,
+    ) -> QuakeFilter:
+        """Make the filter of the earthquakes. The negative magnitudes are always filtered out."""
+        return {
+            "min_mag": max(min_mag or 0.0, 0.0),
+            "max_mag": np.inf if max_mag is None else max_mag,
+            "start_time": -np.inf if start_time is None else _epoch_ms(start_time),
+            "end_time": np.inf if end_time is None else _epoch_ms(end_time),
+            "bbox": bbox,
+        }
+
     def _read_text(self, reformat_path: Optional[Path]) -> None:
         """Try to read the earthquakes file."""
         try:
@@ -71,64 +241,159 @@ class EarthquakesPlotter:  # pylint: disable=R0902
             sys.exit()
 
     def _reformat_file(self, reformat_path: Optional[Path]) -> None:
-        """Reformat the json file to make it readable if desired."""
-        self._load_text()
+        """Reformat the json file to make it readable if desired, as its features are parsed."""
+        self._load_text(Path(reformat_path) if reformat_path else None)
+
+    def write_readable(self, reformat_path: Path) -> None:
+        """Write a readable copy of the json file, one feature at a time, without extracting the data."""
+        self._read_text(reformat_path)
+        # Parsing the features writes them, only one of them is in memory at a time.
+        for _ in self.quakes_data["features"]:
+            pass
 
-        if reformat_path:
-            path: Path = Path(reformat_path)
-            readable_contents: str = json.dumps(self.quakes_data, indent=4)
-            path.write_text(readable_contents, encoding="utf-8")
+    def _load_text(self, readable_path: Optional[Path] = None) -> None:
+        """
+        Open the json file and stream its features: quakes_data["features"] yields them
+        one at a time, and the other members (metadata...) are stored as they are parsed.
+        If a readable_path is given, the file is also written there as it's parsed.
+        """
+        quakes_file: TextIO = self.path.open(encoding="utf-8")
+        self.quakes_data = {"features": self._stream_features(quakes_file, readable_path)}  # pylint: disable=W0201
+
+    def _stream_features(self, quakes_file: TextIO, readable_path: Optional[Path] = None) -> Iterator[dict[str, Any]]:
+        """Yield the features of the file one at a time, storing the other members in quakes_data."""
+        readable_copy: AbstractContextManager[Optional[TextIO]] = (
+            _replaced_on_success(readable_path) if readable_path else nullcontext()
+        )
+        with quakes_file, readable_copy as readable_file:
+            stream: _JsonStream = _JsonStream(quakes_file, CHUNK_SIZE)
+            writer: Optional[_ReadableWriter] = None if readable_file is None else _ReadableWriter(readable_file)
+            stream.next_char("{")
+            more_members: bool = stream.peek_char() != "}"
+            while more_members:
+                key: str = stream.decode_value()
+                stream.next_char(":")
+                if key == "features":
+                    yield from self._stream_items(stream, key, writer)
+                else:
+                    self.quakes_data[key] = stream.decode_value()
+                    if writer:
+                        writer.member(key, self.quakes_data[key])
+                more_members = stream.next_char(",}") == ","
+            if writer:
+                writer.close()
+            # The copy may replace the json file itself, which must be closed first on some systems.
+            quakes_file.close()
 
-    def _load_text(self) -> None:
-        """Convert the json file into a python object."""
-        contents: str = self.path.read_text(encoding="utf-8")
-        self.quakes_data = json.loads(contents)  # pylint: disable=W0201
+    def _stream_items(self, stream: _JsonStream, key: str, writer: Optional[_ReadableWriter]) -> Iterator[Any]:
+        """Yield the items of the array member, writing them to the readable file if there is one."""
+        if writer is None:
+            yield from self._stream_array(stream)
+            return
+
+        writer.begin_array(key)
+        for item in self._stream_array(stream):
+            writer.item(item)
+            yield item
+        writer.end_array()
+
+    @staticmethod
+    def _stream_array(stream: _JsonStream) -> Iterator[Any]:
+        """Yield the items of the array at the position of the stream."""
+        stream.next_char("[")
+        if stream.peek_char() == "]":
+            stream.next_char("]")
+            return
+        while True:
+            yield stream.decode_value()
+            if stream.next_char(",]") == "]":
+                return
 
     def _extract_data(self) -> None:
         """Extract the data of interest from the python object."""
-        quakes: list[dict[str, Any]] = self.quakes_data["features"]
+        quakes: Iterator[dict[str, Any]] = self.quakes_data["features"]
+        columns: tuple[Any, ...] = (
+            self._collect_columns(quakes)
+            if self.quakes_store is None
+            else self._merge_quakes(self.quakes_store, quakes)
+        )
+        mags, longs, lats, times, event_titles = columns
+        self.mags = np.frombuffer(mags)  # pylint: disable=W0201
+        self.longs = np.frombuffer(longs)  # pylint: disable=W0201
+        self.lats = np.frombuffer(lats)  # pylint: disable=W0201
+        self.times = np.frombuffer(times, dtype=np.int64).view("datetime64[ms]")  # pylint: disable=W0201
+        self.event_titles = np.array(event_titles, dtype=object)  # pylint: disable=W0201
+
+        self._format_dates()
+        self._format_title()
+
+    def _collect_columns(self, quakes: Iterator[dict[str, Any]]) -> tuple[array, array, array, array, list[str]]:
+        """
+        Collect magnitude, longitude, latitude, time and title of each earthquake in typed arrays,
+        skipping the earthquakes out of the filter (or with a missing magnitude).
+        """
+        mags: array = array("d")
+        longs: array = array("d")
+        lats: array = array("d")
+        times: array = array("q")
+        event_titles: list[str] = []
 
-        # Extract magnitude, longitude, latitude, title and date for each earthquake
-        #   only if the magnitude is not negative.
         for quake in quakes:
-            if quake["properties"]["mag"] >= 0:
-                try:
-                    self._collect_data(quake)
-                except KeyError as ke:
-                    logging.error("%s missing in earthquake: %s", ke, quake)
-                    sys.exit()
-                else:
-                    self._get_quakes_date()
-                    self._append_data()
+            try:
+                mag, long, lat, time, event_title = quake_fields(quake)
+            except KeyError as ke:
+                logging.error("%s missing in earthquake: %s", ke, quake)
+                sys.exit()
+            if mag is None or not self._in_filter(mag, long, lat, time):
+                continue
+            mags.append(mag)
+            longs.append(long)
+            lats.append(lat)
+            times.append(time)
+            event_titles.append(event_title)
 
-        self._format_title()
+        return mags, longs, lats, times, event_titles
+
+    def _merge_quakes(
+        self, quakes_store: QuakesStore, quakes: Iterator[dict[str, Any]]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Merge the new or updated earthquakes in the store and read back the ones in the filter."""
+        try:
+            merged: int = quakes_store.merge(quakes)
+        except KeyError as ke:
+            logging.error("%s missing in an earthquake of %s", ke, self.path)
+            sys.exit()
+        logging.info("%d new or updated earthquakes merged from %s", merged, self.path)
+        return quakes_store.columns(**self.quake_filter)
+
+    def _in_filter(self, mag: float, long: float, lat: float, time: int) -> bool:
+        """Check if an earthquake is in the magnitude range, time window and bounding box."""
+        quake_filter: QuakeFilter = self.quake_filter
+        if not quake_filter["min_mag"] <= mag <= quake_filter["max_mag"]:
+            return False
+        if not quake_filter["start_time"] <= time <= quake_filter["end_time"]:
+            return False
+        if quake_filter["bbox"] is None:
+            return True
+
+        min_long, min_lat, max_long, max_lat = quake_filter["bbox"]
+        if not min_lat <= lat <= max_lat:
+            return False
+        if min_long <= max_long:
+            return min_long <= long <= max_long
+        # The bounding box crosses the antimeridian.
+        return long >= min_long or long <= max_long
 
-    def _collect_data(self, quake: dict[str, Any]) -> None:
-        """Collect the data of interest."""
-        self.mag = quake["properties"]["mag"]  # pylint: disable=W0201
-        self.long = quake["geometry"]["coordinates"][0]  # pylint: disable=W0201
-        self.lat = quake["geometry"]["coordinates"][1]  # pylint: disable=W0201
-        self.event_title = quake["properties"]["title"]  # pylint: disable=W0201
-        self.timestamp_seconds = quake["properties"]["time"] / 1000  # pylint: disable=W0201
-
-    def _get_quakes_date(self) -> None:
-        """Get the date of each earthquake and format it."""
-        utc_timezone: timezone = timezone.utc
-        quake_datetime: datetime = datetime.fromtimestamp(self.timestamp_seconds, utc_timezone)
-        # Format the date for the label of each earthquake.
-        self.date = quake_datetime.strftime("%B %d, %Y -- %H:%M:%S %Z (24-Hour format)")  # pylint: disable=W0201
-        # Format the date for the plot title.
-        self.title_date = quake_datetime.strftime("%B %Y")  # pylint: disable=W0201
-
-    def _append_data(self) -> None:
-        """Store the collected data in lists."""
-        self.mags.append(self.mag)
-        self.longs.append(self.long)
-        self.lats.append(self.lat)
-        self.event_titles.append(self.event_title)
-        self.event_dates.append(self.date)
-        if self.title_date not in self.title_dates:
-            self.title_dates.append(self.title_date)
+    def _format_dates(self) -> None:
+        """Format the dates of the earthquakes for their labels and for the plot title at once."""
+        quake_datetimes: pd.DatetimeIndex = pd.DatetimeIndex(self.times).tz_localize("UTC")
+        self.event_dates = quake_datetimes.strftime(DATE_FORMAT).to_numpy(dtype=object)  # pylint: disable=W0201
+
+        # The months of the earthquakes, in the order they first appear in the file.
+        months: np.ndarray = self.times.astype("datetime64[M]")
+        first_indices: np.ndarray = np.sort(np.unique(months, return_index=True)[1])
+        first_months: pd.DatetimeIndex = pd.DatetimeIndex(months[first_indices])
+        self.title_dates = list(first_months.strftime(TITLE_DATE_FORMAT))  # pylint: disable=W0201
 
     def _format_title(self) -> None:
         """Neatly format the plot title."""
@@ -148,21 +413,68 @@ class EarthquakesPlotter:  # pylint: disable=R0902
             self.title_dates[0] = first_date_split[0]
 
     def _quakes_dataframe(self) -> None:
-        """Make a dataframe of the earthquakes data."""
-        quakes_df: dict[str, list[Any]] = {
+        """Make a dataframe of the earthquakes data, wrapping the columns without copying them."""
+        quakes_df: dict[str, np.ndarray] = {
             "Magnitude": self.mags,
             "Latitude": self.lats,
             "Longitude": self.longs,
             "Event Title": self.event_titles,
             "Date": self.event_dates,
+            "Time": self.times,
         }
 
-        self.dataframe = pd.DataFrame(quakes_df)
+        self.dataframe = pd.DataFrame(quakes_df, copy=False)
+        self._quakes_index = None
+
+    @property
+    def quakes_index(self) -> QuakesIndex:
+        """The spatial index of the earthquakes, built on the first query."""
+        if self._quakes_index is None:
+            self._quakes_index = QuakesIndex(self.lats, self.longs)
+        return self._quakes_index
+
+    def quakes_within(self, lat: float, long: float, radius_km: float) -> pd.DataFrame:
+        """Return the rows of the dataframe of the earthquakes within radius_km of the point."""
+        return self.dataframe.iloc[self.quakes_index.within_radius(lat, long, radius_km)]
+
+    def quakes_in_polygon(self, polygon: Sequence[tuple[float, float]]) -> pd.DataFrame:
+        """Return the rows of the dataframe of the earthquakes inside the polygon of (longitude, latitude)."""
+        return self.dataframe.iloc[self.quakes_index.within_polygon(polygon)]
+
+    def plot_quakes(
+        self, quakes_color: str, title_color: Optional[str] = None, dataframe: Optional[pd.DataFrame] = None
+    ) -> None:
+        """Plot the earthquakes, or the rows of the dataframe given, such as a subset returned by quakes_within."""
+        fig: Figure = self.quakes_figure(quakes_color, title_color, dataframe)
+        fig.show()
+
+    def quakes_figure(  # pylint: disable=R0913
+        self,
+        quakes_color: str,
+        title_color: Optional[str] = None,
+        dataframe: Optional[pd.DataFrame] = None,
+        max_markers: int = MAX_MARKERS,
+        cell_size: float = AGGREGATE_CELL_SIZE,
+    ) -> Figure:
+        """
+        Make the figure of the earthquakes. Up to max_markers earthquakes are plotted as markers,
+        past that they are aggregated in cells of cell_size degrees to keep the figure light.
+        """
+        quakes_df: pd.DataFrame = self.dataframe if dataframe is None else dataframe
+        fig: Figure
+        if len(quakes_df) <= max_markers:
+            fig = self._markers_figure(quakes_df, quakes_color)
+        else:
+            fig = self._cells_figure(self._aggregate_quakes(quakes_df, cell_size), quakes_color)
+
+        self._update_fig_title(fig, title_color)
+        return fig
 
-    def plot_quakes(self, quakes_color: str, title_color: Optional[str] = None) -> None:
-        """Plot the earthquakes."""
-        fig: Figure = px.scatter_geo(
-            data_frame=self.dataframe,
+    @staticmethod
+    def _markers_figure(quakes_df: pd.DataFrame, quakes_color: str) -> Figure:
+        """Make the figure with a marker per earthquake."""
+        return px.scatter_geo(
+            data_frame=quakes_df,
             size="Magnitude",
             lat="Latitude",
             lon="Longitude",
@@ -170,11 +482,58 @@ class EarthquakesPlotter:  # pylint: disable=R0902
             color_continuous_scale=quakes_color,
             projection="robinson",
             hover_name="Event Title",
-            hover_data={"Date": True},
+            # The times are formatted by plotly.js, so no label string is stored per quake.
+            hover_data={"Time": f"|{HOVER_DATE_FORMAT}"},
+            labels={"Time": "Date"},
         )
 
-        self._update_fig_title(fig, title_color)
-        fig.show()
+    @staticmethod
+    def _aggregate_quakes(quakes_df: pd.DataFrame, cell_size: float) -> pd.DataFrame:
+        """
+        Aggregate the earthquakes in a latitude/longitude grid. Return the center of each
+        cell with earthquakes, their count, max magnitude and total energy released.
+        """
+        # The quakes at the north pole belong to the last row, as in the QuakesIndex grid.
+        n_rows: int = int(np.ceil(180 / cell_size))
+        lat_rows: np.ndarray = np.clip(np.floor((quakes_df["Latitude"].to_numpy() + 90) / cell_size), 0, n_rows - 1)
+        long_cols: np.ndarray = np.floor(((quakes_df["Longitude"].to_numpy() + 180) % 360) / cell_size)
+        mags: np.ndarray = quakes_df["Magnitude"].to_numpy()
+        # The energy in joules from the magnitude, log10(E) = 1.5 M + 4.8 (Gutenberg-Richter).
+        energies: np.ndarray = 10 ** (1.5 * mags + 4.8)
+
+        cells_df: pd.DataFrame = (
+            pd.DataFrame({"Row": lat_rows, "Col": long_cols, "Magnitude": mags, "Energy": energies})
+            .groupby(["Row", "Col"], sort=False)
+            .agg(
+                Count=("Magnitude", "size"),
+                **{"Max Magnitude": ("Magnitude", "max"), "Energy (J)": ("Energy", "sum")},
+            )
+            .reset_index()
+        )
+        # The last row ends at the north pole when 180 isn't a multiple of the cell size.
+        cell_ends: np.ndarray = np.minimum((cells_df["Row"] + 1) * cell_size, 180)
+        cells_df["Latitude"] = (cells_df["Row"] * cell_size + cell_ends) / 2 - 90
+        cells_df["Longitude"] = (cells_df["Col"] + 0.5) * cell_size - 180
+        return cells_df.drop(columns=["Row", "Col"])
+
+    @staticmethod
+    def _cells_figure(cells_df: pd.DataFrame, quakes_color: str) -> Figure:
+        """Make the figure with a marker per grid cell, sized by the count of its earthquakes."""
+        return px.scatter_geo(
+            data_frame=cells_df,
+            size="Count",
+            lat="Latitude",
+            lon="Longitude",
+            color="Max Magnitude",
+            color_continuous_scale=quakes_color,
+            projection="robinson",
+            hover_data={"Count": True, "Max Magnitude": True, "Energy (J)": ":.3g"},
+        )
+
+    @staticmethod
+    def export_figure(fig: Figure, path: Path, shared_plotlyjs: bool = False, float32: bool = False) -> None:
+        """Write the figure as compact HTML, or JSON if the path ends in .json (see figure_export)."""
+        figure_export.export_figure(fig, path, shared_plotlyjs, float32)
 
     def _update_fig_title(self, fig: Figure, title_color: Optional[str]) -> None:
         """Update the layout of the title."""
@@ -186,3 +545,32 @@ class EarthquakesPlotter:  # pylint: disable=R0902
                 "x": 0.48,
             }
         )
+
+
+@contextmanager
+def _replaced_on_success(path: Path) -> Iterator[TextIO]:
+    """
+    Open a temporary file next to path, moved onto path only when the block completes.
+    The file at path is left as it was if the block fails or the parsing is abandoned.
+    """
+    temp_path: Path = path.with_name(f"{path.name}.tmp")
+    temp_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with temp_path.open("w", encoding="utf-8") as temp_file:
+            yield temp_file
+        temp_path.replace(path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def _indented(value: Any, level: int) -> str:
+    """Return the value as json.dumps(..., indent=4) lays it out, nested at the indentation level."""
+    return json.dumps(value, indent=4).replace("\n", "\n" + READABLE_INDENT * level)
+
+
+def _epoch_ms(time: TimeBound) -> float:
+    """Convert a time to epoch milliseconds, as the times of the features. Naive times are UTC."""
+    timestamp: pd.Timestamp = pd.Timestamp(time)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize("UTC")
+    return timestamp.value / 1e6
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+
+"""
+This module defines the 'QuakesStore' class to keep the earthquakes of the USGS feeds
+in a local SQLite database, so overlapping feeds can be merged run after run.
+
+The class allows to:
+- Store each earthquake once, keyed on its USGS feature id.
+- Merge a feed by upsert, keeping the latest revision of each earthquake by its updated time.
+- Skip the earthquakes already stored with the same revision, so a merge costs only the changes.
+- Keep the stored earthquakes as columns in memory, read once and patched with the changes of each merge.
+- Return the columns of the stored earthquakes, filtered by magnitude, time and bounding box.
+"""
+
+from pathlib import Path
+from typing import Any, Iterable, Optional
+import sqlite3
+
+import numpy as np
+
+CREATE_TABLE: str = """
+    CREATE TABLE IF NOT EXISTS quakes (
+        id TEXT PRIMARY KEY,
+        updated INTEGER NOT NULL,
+        mag REAL,
+        long REAL NOT NULL,
+        lat REAL NOT NULL,
+        time INTEGER NOT NULL,
+        title TEXT NOT NULL
+    )
+"""
+CREATE_TIME_INDEX: str = "CREATE INDEX IF NOT EXISTS quakes_time ON quakes (time)"
+UPSERT: str = """
+    INSERT INTO quakes (id, updated, mag, long, lat, time, title) VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (id) DO UPDATE SET
+        updated = excluded.updated,
+        mag = excluded.mag,
+        long = excluded.long,
+        lat = excluded.lat,
+        time = excluded.time,
+        title = excluded.title
+    WHERE excluded.updated > quakes.updated
+"""
+SELECT_ROWS: str = "SELECT id, updated, mag, long, lat, time, title FROM quakes"
+
+BoundingBox = tuple[float, float, float, float]
+QuakeFields = tuple[Optional[float], float, float, int, str]
+QuakeRow = tuple[str, int, Optional[float], float, float, int, str]
+
+
+def quake_fields(feature: dict[str, Any]) -> QuakeFields:
+    """Return the magnitude, longitude, latitude, epoch milliseconds and title of a feature."""
+    properties: dict[str, Any] = feature["properties"]
+    coordinates: list[float] = feature["geometry"]["coordinates"]
+    return properties["mag"], coordinates[0], coordinates[1], properties["time"], properties["title"]
+
+
+def _grow(column: np.ndarray, capacity: int) -> np.ndarray:
+    """Return a copy of the column with room for capacity items."""
+    grown: np.ndarray = np.empty(capacity, dtype=column.dtype)
+    grown[: len(column)] = column
+    return grown
+
+
+class QuakesStore:  # pylint: disable=R0902
+    """Keep the latest revision of the earthquakes of many feeds in a SQLite database."""
+
+    def __init__(self, path: Path) -> None:
+        """Open the database, making it if it doesn't exist."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection: sqlite3.Connection = sqlite3.connect(self.path)
+        with self.connection:
+            self.connection.execute(CREATE_TABLE)
+            self.connection.execute(CREATE_TIME_INDEX)
+        # The stored earthquakes, read from the database on first use and then patched by the merges.
+        self._rows_read: bool = False
+        self._updates: dict[str, int] = {}
+        self._positions: dict[str, int] = {}
+        self._size: int = 0
+        self._mags: np.ndarray = np.empty(0)
+        self._longs: np.ndarray = np.empty(0)
+        self._lats: np.ndarray = np.empty(0)
+        self._times: np.ndarray = np.empty(0, dtype=np.int64)
+        self._titles: np.ndarray = np.empty(0, dtype=object)
+
+    @property
+    def updates(self) -> dict[str, int]:
+        """The updated time of each stored earthquake, read once from the database."""
+        if not self._rows_read:
+            self._read_rows()
+        return self._updates
+
+    def _read_rows(self) -> None:
+        """Read the stored earthquakes into the columns, the only time the whole database is read."""
+        rows: list[QuakeRow] = self.connection.execute(SELECT_ROWS).fetchall()
+        self._updates = {row[0]: row[1] for row in rows}
+        self._patch_columns(rows)
+        self._rows_read = True
+
+    def merge(self, features: Iterable[dict[str, Any]]) -> int:
+        """
+        Upsert the features that are new or more recently updated than the stored ones,
+        and return how many there were. The other features are skipped without extracting
+        their data. Raise KeyError if a new or changed feature misses a field.
+        """
+        updates: dict[str, int] = self.updates
+        # The updated times of the merged features, kept apart until the rows are committed.
+        merged_updates: dict[str, int] = {}
+        rows: list[QuakeRow] = []
+        for feature in features:
+            quake_id: str = feature["id"]
+            updated: int = feature["properties"]["updated"]
+            if max(updates.get(quake_id, -1), merged_updates.get(quake_id, -1)) >= updated:
+                continue
+            rows.append((quake_id, updated, *quake_fields(feature)))
+            merged_updates[quake_id] = updated
+
+        with self.connection:
+            self.connection.executemany(UPSERT, rows)
+        updates.update(merged_updates)
+        self._patch_columns(rows)
+        return len(rows)
+
+    def _patch_columns(self, rows: list[QuakeRow]) -> None:
+        """Overwrite the columns of the stored earthquakes in the rows and append the new ones."""
+        if not rows:
+            return
+        positions: list[int] = []
+        for row in rows:
+            if row[0] not in self._positions:
+                self._positions[row[0]] = self._size
+                self._size += 1
+            positions.append(self._positions[row[0]])
+
+        if self._size > len(self._times):
+            capacity: int = max(self._size, 2 * len(self._times))
+            self._mags, self._longs, self._lats, self._times, self._titles = (
+                _grow(column, capacity) for column in self._columns_of(len(self._times))
+            )
+        # The earthquakes without a magnitude are NaN, so no range comparison selects them.
+        self._mags[positions] = [np.nan if row[2] is None else row[2] for row in rows]
+        self._longs[positions] = [row[3] for row in rows]
+        self._lats[positions] = [row[4] for row in rows]
+        self._times[positions] = [row[5] for row in rows]
+        self._titles[positions] = [row[6] for row in rows]
+
+    def columns(  # pylint: disable=R0913,R0914
+        self,
+        min_mag: float = 0.0,
+        max_mag: float = np.inf,
+        start_time: float = -np.inf,
+        end_time: float = np.inf,
+        bbox: Optional[BoundingBox] = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the magnitudes, longitudes, latitudes, epoch milliseconds and titles of the stored
+        earthquakes in the ranges, the most recent first as in the USGS feeds. The earthquakes
+        without a magnitude are left out. The bbox crosses the antimeridian if min longitude > max longitude.
+        The columns are selected in memory, the database isn't read again.
+        """
+        if not self._rows_read:
+            self._read_rows()
+        mags, longs, lats, times, titles = self._columns_of(self._size)
+        selected: np.ndarray = (mags >= min_mag) & (mags <= max_mag) & (times >= start_time) & (times <= end_time)
+        if bbox is not None:
+            min_long, min_lat, max_long, max_lat = bbox
+            in_longs: np.ndarray = (
+                (longs >= min_long) & (longs <= max_long)
+                if min_long <= max_long
+                else (longs >= min_long) | (longs <= max_long)
+            )
+            selected &= (lats >= min_lat) & (lats <= max_lat) & in_longs
+
+        positions: np.ndarray = np.flatnonzero(selected)
+        positions = positions[np.argsort(-times[positions], kind="stable")]
+        return mags[positions], longs[positions], lats[positions], times[positions], titles[positions]
+
+    def _columns_of(self, size: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return the first size items of the columns."""
+        return self._mags[:size], self._longs[:size], self._lats[:size], self._times[:size], self._titles[:size]
+
+    def __len__(self) -> int:
+        """Return the number of stored earthquakes."""
+        return self.connection.execute("SELECT COUNT(*) FROM quakes").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database."""
+        self.connection.close()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+"""This module tests the 'QuakesIndex' class to ensure it works as expected."""
+
+from pathlib import Path
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from quakes_index import QuakesIndex as QI
+from quakes_index import haversine_km
+from quakes_plotter import EarthquakesPlotter as EP
+
+
+@pytest.fixture(name="epicenters")
+def epicenters_fixture() -> tuple[np.ndarray, np.ndarray]:
+    """Random epicenters spread uniformly on the sphere, available for all tests."""
+    rng: np.random.Generator = np.random.default_rng(0)
+    lats: np.ndarray = np.degrees(np.arcsin(rng.uniform(-1, 1, 50_000)))
+    longs: np.ndarray = rng.uniform(-180, 180, 50_000)
+    return lats, longs
+
+
+@pytest.mark.parametrize(
+    "lat, long, radius_km",
+    [(0.0, 0.0, 300.0), (89.5, 10.0, 300.0), (-10.0, 179.9, 800.0), (60.0, 100.0, 3000.0)],
+)
+def test_within_radius(epicenters: tuple[np.ndarray, np.ndarray], lat: float, long: float, radius_km: float) -> None:
+    """Test if the radius queries match a full scan, near the poles and the antimeridian too."""
+    lats, longs = epicenters
+    quakes_index: QI = QI(lats, longs)
+    expected: np.ndarray = np.flatnonzero(haversine_km(lats, longs, lat, long) <= radius_km)
+
+    assert len(expected)
+    assert np.array_equal(quakes_index.within_radius(lat, long, radius_km), expected)
+
+
+def test_within_region(epicenters: tuple[np.ndarray, np.ndarray]) -> None:
+    """Test if the polygon and bounding box queries match a full scan."""
+    lats, longs = epicenters
+    quakes_index: QI = QI(lats, longs)
+    # A triangle, so a point is inside if it's on the inner side of its three edges.
+    triangle: list[tuple[float, float]] = [(-10.0, -10.0), (20.0, -10.0), (-10.0, 20.0)]
+    inside: np.ndarray = (longs > -10) & (lats > -10) & (longs + lats < 10)
+
+    assert np.array_equal(quakes_index.within_polygon(triangle), np.flatnonzero(inside))
+    in_bbox: np.ndarray = ((longs >= 170) | (longs <= -170)) & (np.abs(lats) <= 10)
+    assert np.array_equal(quakes_index.within_bbox(170, -10, -170, 10), np.flatnonzero(in_bbox))
+
+
+def test_quakes_within() -> None:
+    """Test if the plotter returns the rows of its dataframe around a point."""
+    quakes_plotter: EP = EP(Path("earthquakes_files", "4.5_month.geojson"))
+    quakes_plotter.analyze_data()
+    # Around the epicenter of the M 7.1 earthquake of July 11, 2024 in the Philippines.
+    nearby: pd.DataFrame = quakes_plotter.quakes_within(6.0646, 123.1605, 300)
+
+    distances: np.ndarray = haversine_km(quakes_plotter.lats, quakes_plotter.longs, 6.0646, 123.1605)
+    assert len(nearby) == (distances <= 300).sum()
+    assert "M 7.1 - 106 km WSW of Sangay, Philippines" in list(nearby["Event Title"])
+    assert (nearby.columns == quakes_plotter.dataframe.columns).all()
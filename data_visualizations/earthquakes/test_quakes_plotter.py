@@ -4,8 +4,13 @@
 
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Generator, Iterator
+from unittest.mock import patch
+import base64
+import json
 import pytest
+import numpy as np
+import pandas as pd
 
 from quakes_plotter import EarthquakesPlotter as EP
 
@@ -103,3 +108,162 @@ def test_is_negative_mag_appended(quakes_plotter: EP, quake_dictionary: dict[str
 
     assert negative_quake["properties"]["mag"] not in quakes_plotter.mags
     assert quake_dictionary["properties"]["mag"] in quakes_plotter.mags
+
+
+def test_features_streamed(path: Path) -> None:
+    """Test if the features are parsed one at a time and match the whole file parsed at once."""
+    quakes_data: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    stream_plot: EP = EP(path)
+    # Disabling pylint warning for accessing protected members.
+    with patch("quakes_plotter.CHUNK_SIZE", 97):
+        stream_plot._load_text()  # pylint: disable=W0212
+        features: Iterator[dict[str, Any]] = stream_plot.quakes_data["features"]
+        assert not isinstance(features, list)
+        assert next(features) == quakes_data["features"][0]
+        assert list(features) == quakes_data["features"][1:]
+
+    assert stream_plot.quakes_data["metadata"] == quakes_data["metadata"]
+    assert stream_plot.quakes_data["bbox"] == quakes_data["bbox"]
+
+
+def test_columns_typed(quakes_plotter: EP, quake_dictionary: dict[str, dict[str, Any]]) -> None:
+    """Test if the data is extracted in typed columns that the dataframe wraps without copying."""
+    missing_mag: dict[str, dict[str, Any]] = {**quake_dictionary, "properties": {**quake_dictionary["properties"]}}
+    missing_mag["properties"]["mag"] = None
+    quakes_plotter.quakes_data = {
+        "features": [quake_dictionary, missing_mag, quake_dictionary],
+        "metadata": {"title": "Test Earthquake Data"},
+    }
+    # Disabling pylint warning for accessing protected members.
+    quakes_plotter._extract_data()  # pylint: disable=W0212
+    quakes_plotter._quakes_dataframe()  # pylint: disable=W0212
+
+    assert quakes_plotter.mags.dtype == np.float64 and len(quakes_plotter.mags) == 2
+    assert quakes_plotter.times.dtype == np.dtype("datetime64[ms]")
+    assert quakes_plotter.times[0] == np.datetime64(quake_dictionary["properties"]["time"], "ms")
+    assert quakes_plotter.title_dates == ["July 2024"]
+    for column, values in (("Magnitude", quakes_plotter.mags), ("Latitude", quakes_plotter.lats)):
+        assert np.shares_memory(quakes_plotter.dataframe[column].to_numpy(), values)
+
+
+def test_filters_applied_while_parsing(path: Path) -> None:
+    """Test if only the earthquakes in the magnitude range, time window and bounding box are extracted."""
+    quakes_data: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    filter_plot: EP = EP(path)
+    filter_plot.analyze_data(min_mag=6.5, start_time="2024-07-01", bbox=(100.0, -60.0, -100.0, 60.0))
+
+    expected: list[str] = []
+    for quake in quakes_data["features"]:
+        long, lat = quake["geometry"]["coordinates"][:2]
+        quake_time: datetime = datetime.fromtimestamp(quake["properties"]["time"] / 1000, timezone.utc)
+        if (
+            quake["properties"]["mag"] >= 6.5
+            and quake_time >= datetime(2024, 7, 1, tzinfo=timezone.utc)
+            and (long >= 100 or long <= -100)
+            and -60 <= lat <= 60
+        ):
+            expected.append(quake["properties"]["title"])
+    assert 0 < len(expected) < len(quakes_data["features"])
+    assert list(filter_plot.dataframe["Event Title"]) == expected
+    assert len(filter_plot.event_dates) == len(expected)
+
+
+def test_quakes_aggregated() -> None:
+    """Test if past max_markers the earthquakes are plotted as grid cells with their count, max magnitude and energy."""
+    quakes_plotter: EP = EP(Path("earthquakes_files", "4.5_month.geojson"))
+    quakes_plotter.analyze_data()
+    markers_fig = quakes_plotter.quakes_figure("Viridis")
+    cells_fig = quakes_plotter.quakes_figure("Viridis", max_markers=100, cell_size=10.0)
+    # Disabling pylint warning for accessing protected members.
+    cells_df = quakes_plotter._aggregate_quakes(quakes_plotter.dataframe, 10.0)  # pylint: disable=W0212
+
+    assert len(markers_fig.data[0].lat) == len(quakes_plotter.dataframe)
+    assert len(cells_fig.data[0].lat) == len(cells_df) < len(quakes_plotter.dataframe)
+    assert cells_df["Count"].sum() == len(quakes_plotter.dataframe)
+    assert cells_df["Max Magnitude"].max() == quakes_plotter.mags.max()
+    assert cells_df["Energy (J)"].sum() == pytest.approx((10 ** (1.5 * quakes_plotter.mags + 4.8)).sum())
+    assert cells_fig.layout.title.text == quakes_plotter.formatted_plot_title
+
+
+def test_polar_quakes_aggregated() -> None:
+    """Test if the earthquakes at the poles are aggregated in the first and last rows of cells."""
+    quakes_df: pd.DataFrame = pd.DataFrame(
+        {"Latitude": [90.0, 89.0, -90.0], "Longitude": [10.0, 10.0, 10.0], "Magnitude": [5.0, 6.0, 5.0]}
+    )
+    # Disabling pylint warning for accessing protected members.
+    cells_df: pd.DataFrame = EP._aggregate_quakes(quakes_df, 7.0)  # pylint: disable=W0212
+
+    assert list(cells_df["Count"]) == [2, 1]
+    assert list(cells_df["Latitude"]) == [87.5, -86.5]
+    assert list(cells_df["Max Magnitude"]) == [6.0, 5.0]
+
+
+def test_figure_exported_compact(quakes_plotter: EP, tmp_path: Path) -> None:
+    """Test if the figures are exported with typed arrays, hover templates and a shared plotly.js bundle."""
+    quakes_plotter.analyze_data()
+    fig = quakes_plotter.quakes_figure("Viridis")
+    quakes_plotter.export_figure(fig, tmp_path / "quakes.json", float32=True)
+    trace: dict[str, Any] = json.loads((tmp_path / "quakes.json").read_text(encoding="utf-8"))["data"][0]
+
+    assert trace["lat"]["dtype"] == "f4"
+    lats: np.ndarray = np.frombuffer(base64.b64decode(trace["lat"]["bdata"]), dtype=np.float32)
+    assert np.allclose(lats, quakes_plotter.lats)
+    # The hover dates are ISO strings, as the date format of the hover template needs.
+    hover_times: np.ndarray = np.array([row[0] for row in trace["customdata"]], dtype="datetime64[ms]")
+    assert (hover_times == quakes_plotter.times).all()
+    assert "%{customdata[0]|%B %d, %Y -- %H:%M:%S UTC" in trace["hovertemplate"]
+
+    for name in ("first_map.html", "second_map.html"):
+        quakes_plotter.export_figure(fig, tmp_path / "maps" / name, shared_plotlyjs=True)
+    assert sorted(path.name for path in (tmp_path / "maps").iterdir()) == [
+        "first_map.html",
+        "plotly.min.js",
+        "second_map.html",
+    ]
+    assert (tmp_path / "maps" / "first_map.html").stat().st_size < 100_000
+
+
+def test_readable_streamed(path: Path, tmp_path: Path) -> None:
+    """Test if the readable copy is written while parsing, as json.dumps would write the whole file."""
+    expected: str = json.dumps(json.loads(path.read_text(encoding="utf-8")), indent=4)
+    with patch("quakes_plotter.CHUNK_SIZE", 97):
+        stream_plot: EP = EP(path)
+        stream_plot.analyze_data(tmp_path / "analyzed_readable.geojson", min_mag=7)
+        EP(path).write_readable(tmp_path / "readable.geojson")
+
+    assert (tmp_path / "analyzed_readable.geojson").read_text(encoding="utf-8") == expected
+    assert (tmp_path / "readable.geojson").read_text(encoding="utf-8") == expected
+    assert len(stream_plot.dataframe) == 2
+
+
+def test_readable_replaces_feed(path: Path, tmp_path: Path) -> None:
+    """Test if the readable copy can be written over the feed being parsed."""
+    expected: str = json.dumps(json.loads(path.read_text(encoding="utf-8")), indent=4)
+    feed_path: Path = tmp_path / "feed.geojson"
+    feed_path.write_text(path.read_text(encoding="utf-8"), encoding="utf-8")
+    with patch("quakes_plotter.CHUNK_SIZE", 97):
+        feed_plot: EP = EP(feed_path)
+        feed_plot.analyze_data(feed_path)
+
+    assert feed_path.read_text(encoding="utf-8") == expected
+    assert len(feed_plot.dataframe) == len(json.loads(expected)["features"])
+    assert [file.name for file in tmp_path.iterdir()] == ["feed.geojson"]
+
+
+def test_readable_kept_on_failure(path: Path, tmp_path: Path) -> None:
+    """Test if the readable copy is left as it was when the feed is missing or its parsing is abandoned."""
+    readable_path: Path = tmp_path / "readable.geojson"
+    with pytest.raises(SystemExit):
+        EP(tmp_path / "missing.geojson").analyze_data(readable_path)
+    assert not list(tmp_path.iterdir())
+
+    readable_path.write_text("previous copy", encoding="utf-8")
+    abandoned_plot: EP = EP(path)
+    # Disabling pylint warning for accessing protected members.
+    abandoned_plot._read_text(readable_path)  # pylint: disable=W0212
+    features: Generator[dict[str, Any], None, None] = abandoned_plot.quakes_data["features"]
+    next(features)
+    features.close()
+
+    assert readable_path.read_text(encoding="utf-8") == "previous copy"
+    assert [file.name for file in tmp_path.iterdir()] == ["readable.geojson"]
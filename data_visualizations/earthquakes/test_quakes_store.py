@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+"""This module tests the 'QuakesStore' class to ensure it works as expected."""
+
+from pathlib import Path
+from typing import Any
+import json
+import sqlite3
+
+import pytest
+
+from quakes_store import QuakesStore as QS
+from quakes_plotter import EarthquakesPlotter as EP
+
+FEEDS: tuple[Path, ...] = (
+    Path("earthquakes_files", "4.5_month.geojson"),
+    Path("earthquakes_files", "significant_month.geojson"),
+)
+
+
+@pytest.fixture(name="features")
+def features_fixture() -> list[dict[str, Any]]:
+    """The features of the significant earthquakes feed, available for all tests."""
+    quakes_data: dict[str, Any] = json.loads(FEEDS[1].read_text(encoding="utf-8"))
+    return quakes_data["features"]
+
+
+def test_merge_upserts_changes(features: list[dict[str, Any]], tmp_path: Path) -> None:
+    """Test if only the new or updated features are merged, keeping their latest revision."""
+    quakes_store: QS = QS(tmp_path / "quakes.sqlite")
+    assert quakes_store.merge(features) == len(features)
+    assert quakes_store.merge(features) == 0
+
+    revised: dict[str, Any] = json.loads(json.dumps(features[0]))
+    revised["properties"]["mag"] = 9.9
+    revised["properties"]["updated"] += 1
+    outdated: dict[str, Any] = json.loads(json.dumps(features[1]))
+    outdated["properties"]["mag"] = 0.1
+    outdated["properties"]["updated"] -= 1
+    assert quakes_store.merge([revised, outdated]) == 1
+    quakes_store.close()
+
+    # The revisions are kept after the store is opened again.
+    reopened_store: QS = QS(tmp_path / "quakes.sqlite")
+    mags, *_ = reopened_store.columns()
+    assert len(reopened_store) == len(features)
+    assert 9.9 in mags and 0.1 not in mags
+    assert reopened_store.merge([revised]) == 0
+
+
+def test_columns_patched_in_memory(tmp_path: Path) -> None:
+    """Test if the columns are patched by the merges, matching the database without reading it again."""
+    features: list[dict[str, Any]] = json.loads(FEEDS[0].read_text(encoding="utf-8"))["features"]
+    quakes_store: QS = QS(tmp_path / "quakes.sqlite")
+    quakes_store.merge(features[:10])
+    revised: dict[str, Any] = json.loads(json.dumps(features[0]))
+    revised["properties"]["mag"] = 9.9
+    revised["properties"]["updated"] += 1
+
+    statements: list[str] = []
+    quakes_store.connection.set_trace_callback(statements.append)
+    quakes_store.merge([revised, *features[10:]])
+    columns: tuple[Any, ...] = quakes_store.columns(min_mag=5, bbox=(100, -60, -100, 60))
+    assert not any(statement.lstrip().startswith("SELECT") for statement in statements)
+
+    reopened_columns: tuple[Any, ...] = QS(tmp_path / "quakes.sqlite").columns(min_mag=5, bbox=(100, -60, -100, 60))
+    assert 9.9 in columns[0] and len(columns[0]) > 10
+    for column, reopened_column in zip(columns, reopened_columns):
+        assert list(column) == list(reopened_column)
+
+
+def test_failed_merge_not_applied(features: list[dict[str, Any]], tmp_path: Path) -> None:
+    """Test if a merge the database rejects leaves the stored earthquakes as they were, in memory too."""
+    quakes_store: QS = QS(tmp_path / "quakes.sqlite")
+    untitled: dict[str, Any] = json.loads(json.dumps(features[0]))
+    untitled["properties"]["title"] = None
+    with pytest.raises(sqlite3.IntegrityError):
+        quakes_store.merge([features[1], untitled])
+
+    assert not quakes_store.updates and len(quakes_store.columns()[0]) == 0
+    assert quakes_store.merge(features[:2]) == 2
+
+
+def test_feeds_merged_in_plotter(tmp_path: Path) -> None:
+    """Test if the plotter analyzes the union of the feeds merged in the store, without duplicates."""
+    feed_ids: list[set[str]] = []
+    for feed in FEEDS:
+        quakes_data: dict[str, Any] = json.loads(feed.read_text(encoding="utf-8"))
+        feed_ids.append({feature["id"] for feature in quakes_data["features"]})
+
+    for feed in FEEDS:
+        quakes_plotter: EP = EP(feed, store_path=tmp_path / "quakes.sqlite")
+        quakes_plotter.analyze_data()
+
+    assert len(quakes_plotter.dataframe) == len(feed_ids[0] | feed_ids[1])
+    assert quakes_plotter.dataframe["Time"].is_monotonic_decreasing
+    # The filters apply to the stored earthquakes of all the feeds.
+    quakes_plotter.analyze_data(min_mag=6.5)
+    assert len(quakes_plotter.dataframe) == 3 and (quakes_plotter.mags >= 6.5).all()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+"""
+This module exports Plotly figures as compact HTML or JSON files, with the numeric data
+encoded as the base64 typed arrays of plotly.js instead of text.
+
+The module allows to:
+- Encode the numeric arrays of a figure, the integers in the smallest type that holds them.
+- Store the floats in single precision, to halve their size.
+- Leave the dates to Plotly, which writes them as the ISO strings read by the hover date formats.
+- Write the figure as HTML, loading a plotly.js bundle shared by the files of a directory, or as JSON.
+
+The module is shared by the earthquakes and wildfires projects, which import it from this directory.
+"""
+
+from pathlib import Path
+from typing import Any
+import base64
+
+import numpy as np
+import plotly.io as pio
+from plotly.graph_objects import Figure
+
+# The integer dtypes plotly.js reads from typed arrays, from the smallest.
+TYPED_ARRAY_INTEGERS: tuple[str, ...] = ("i1", "u1", "i2", "u2", "i4", "u4")
+
+
+def export_figure(fig: Figure, path: Path, shared_plotlyjs: bool = False, float32: bool = False) -> None:
+    """
+    Write the figure as HTML, or as JSON if the path ends in .json, with the numeric data
+    encoded as typed arrays instead of text. If shared_plotlyjs is True, the HTML loads
+    the plotly.js bundle written once in its directory, so many maps can share it.
+    If float32 is True, the floats are stored in single precision to halve their size.
+    """
+    fig_dict: dict[str, Any] = typed_arrays(fig.to_plotly_json(), float32)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".json":
+        path.write_text(pio.to_json(fig_dict, validate=False), encoding="utf-8")
+    else:
+        pio.write_html(fig_dict, path, include_plotlyjs="directory" if shared_plotlyjs else True, validate=False)
+
+
+def typed_arrays(value: Any, float32: bool = False) -> Any:
+    """
+    Replace the numeric arrays in the figure dictionary with the typed arrays of plotly.js.
+    The other arrays, such as the dates, are left to Plotly.
+    """
+    if isinstance(value, dict) and {"dtype", "bdata"} <= value.keys():
+        # Plotly 6 encodes some arrays itself, they are decoded to be encoded as the others.
+        return _typed_array(decode_typed_array(value), float32)
+    if isinstance(value, dict):
+        return {key: typed_arrays(item, float32) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [typed_arrays(item, float32) for item in value]
+    if isinstance(value, np.ndarray) and value.dtype.kind in "biuf" and value.size:
+        return _typed_array(value, float32)
+    return value
+
+
+def decode_typed_array(typed_array: dict[str, Any]) -> np.ndarray:
+    """Decode a base64 typed array of plotly.js."""
+    values: np.ndarray = np.frombuffer(base64.b64decode(typed_array["bdata"]), dtype=typed_array["dtype"])
+    if "shape" in typed_array:
+        values = values.reshape([int(size) for size in str(typed_array["shape"]).split(",")])
+    return values
+
+
+def _typed_array(values: np.ndarray, float32: bool) -> dict[str, str]:
+    """Encode a numeric array as a base64 typed array."""
+    if values.dtype.kind in "biu":
+        values = values.astype(_integer_dtype(values))
+    elif float32:
+        values = values.astype(np.float32)
+    values = np.ascontiguousarray(values, dtype=values.dtype.newbyteorder("<"))
+
+    typed_array: dict[str, str] = {
+        "dtype": values.dtype.str[1:],
+        "bdata": base64.b64encode(values.tobytes()).decode("ascii"),
+    }
+    if values.ndim > 1:
+        typed_array["shape"] = ",".join(str(size) for size in values.shape)
+    return typed_array
+
+
+def _integer_dtype(values: np.ndarray) -> np.dtype:
+    """Return the smallest typed array dtype holding the integers, or float64 if none does."""
+    low, high = (int(values.min()), int(values.max())) if values.size else (0, 0)
+    for dtype in TYPED_ARRAY_INTEGERS:
+        info: np.iinfo = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.float64)
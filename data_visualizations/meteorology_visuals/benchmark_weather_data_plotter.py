@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+
+"""
+This module benchmarks the 'WeatherDataPlotter' class on synthetic station files,
+so the speed and memory of a change can be compared with the previous results.
+
+The module allows to:
+- Generate NOAA-like station CSV files of any number of station-years and missing rate.
+- Time the parsing by weather_dataset, the _make_plot step and the headless rendering.
+- Record the peak memory of each step with tracemalloc.
+- Store the results as JSON and compare them with a baseline to report regressions.
+
+Run it with:
+    python benchmark_weather_data_plotter.py --output results.json --baseline baseline.json
+"""
+
+from typing import Any, Optional
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import argparse
+import io
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import matplotlib
+
+from weather_data_plotter import WeatherDataPlotter, clear_date_caches
+
+STATION_YEARS: tuple[int, ...] = (1, 10, 100, 1000)
+MISSING_RATES: tuple[float, ...] = (0.0, 0.05)
+REPEATS: int = 3
+TOLERANCE: float = 0.2
+RESULTS_VERSION: int = 1
+STEPS: tuple[str, ...] = ("parse", "make_plot", "render")
+
+
+def make_station_csv(path: Path, station_years: int, missing_rate: float = 0.0, seed: int = 0) -> Path:
+    """
+    Write a station file with the columns of the NOAA exports and a day per row for
+    station_years years. About missing_rate of the weather values are left empty.
+    """
+    rng: np.random.Generator = np.random.default_rng(seed)
+    days: int = 365 * station_years
+    dates: np.ndarray = np.datetime64("1900-01-01") + np.arange(days).astype("timedelta64[D]")
+    columns: list[list[str]] = _station_columns(days, missing_rate, rng)
+
+    with path.open("w", encoding="utf-8") as station_file:
+        station_file.write('"STATION","NAME","DATE","PRCP","TMAX","TMIN"\n')
+        for date, precip, high, low in zip(dates.astype(str), *columns):
+            station_file.write(f'"USW00000001","BENCHMARK STATION, US","{date}","{precip}","{high}","{low}"\n')
+    return path
+
+
+def _station_columns(days: int, missing_rate: float, rng: np.random.Generator) -> list[list[str]]:
+    """Return the precipitation, high and low columns of the days as text, with the missing values empty."""
+    seasons: np.ndarray = np.sin(2 * np.pi * np.arange(days) / 365.25)
+    highs: np.ndarray = (65 + 20 * seasons + rng.normal(0, 6, days)).round()
+    lows: np.ndarray = highs - rng.uniform(5, 25, days).round()
+    precips: np.ndarray = np.where(rng.random(days) < 0.3, rng.exponential(0.3, days), 0).round(2)
+
+    columns: list[list[str]] = []
+    for values in (precips, highs, lows):
+        texts: np.ndarray = values.astype(str)
+        texts[rng.random(days) < missing_rate] = ""
+        columns.append(list(texts))
+    return columns
+
+
+def run_benchmarks(
+    station_years: tuple[int, ...] = STATION_YEARS,
+    missing_rates: tuple[float, ...] = MISSING_RATES,
+    repeats: int = REPEATS,
+) -> dict[str, Any]:
+    """Benchmark every combination of station-years and missing rate and return the results."""
+    results: dict[str, dict[str, float]] = {}
+    with TemporaryDirectory() as temp_dir:
+        for years in station_years:
+            for missing_rate in missing_rates:
+                path: Path = make_station_csv(Path(temp_dir, f"station_{years}.csv"), years, missing_rate)
+                results[_case_name(years, missing_rate)] = _benchmark_file(path, repeats)
+                logging.info("Benchmarked %s station-years, %s missing", years, missing_rate)
+
+    return {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "results": results,
+    }
+
+
+def _case_name(years: int, missing_rate: float) -> str:
+    """Return the name of a benchmark case, used as its key in the results."""
+    return f"{years}y-{missing_rate:.0%}missing"
+
+
+def _benchmark_file(path: Path, repeats: int) -> dict[str, float]:
+    """Return the best time of each step over the repeats, and the peak memory of each step."""
+    timings: dict[str, list[float]] = {step: [] for step in STEPS}
+    for _ in range(repeats):
+        for step, seconds in _run_steps(path, measure_memory=False).items():
+            timings[step].append(seconds)
+
+    # The memory is measured in a separate run, since tracemalloc slows the code down.
+    peak_memory: dict[str, float] = _run_steps(path, measure_memory=True)
+    result: dict[str, float] = {f"{step}_s": min(seconds) for step, seconds in timings.items()}
+    result.update({f"{step}_peak_mb": peak for step, peak in peak_memory.items()})
+    return result
+
+
+def _run_steps(path: Path, measure_memory: bool) -> dict[str, float]:
+    """Run the steps once. Return the time of each step, or its peak memory in MB."""
+    # Parse the dates again on every run, as a new process would.
+    clear_date_caches()
+    # A headless plotter renders without a GUI and without changing the pyplot backend.
+    weather_plotter: WeatherDataPlotter = WeatherDataPlotter(title="Benchmark", headless=True)
+    # Make the figure first, so its setup isn't counted in the steps.
+    weather_plotter.ax.get_window_extent()
+    steps: dict[str, Any] = {
+        "parse": lambda: weather_plotter.weather_dataset(path, high=True, low=True, color="red"),
+        # Disabling pylint warning for accessing protected members.
+        "make_plot": lambda: weather_plotter._make_plot(True),  # pylint: disable=W0212
+        "render": lambda: _render(weather_plotter),
+    }
+
+    measures: dict[str, float] = {}
+    for step, run_step in steps.items():
+        if measure_memory:
+            tracemalloc.start()
+            run_step()
+            measures[step] = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+        else:
+            start: float = time.perf_counter()
+            run_step()
+            measures[step] = time.perf_counter() - start
+    return measures
+
+
+def _render(weather_plotter: WeatherDataPlotter) -> None:
+    """Customize the plot and render it to PNG in memory, as a headless job would."""
+    # Disabling pylint warning for accessing protected members.
+    weather_plotter._customize_plot(None)  # pylint: disable=W0212
+    weather_plotter.fig.savefig(io.BytesIO(), format="png")
+
+
+def compare_results(baseline: dict[str, Any], current: dict[str, Any], tolerance: float = TOLERANCE) -> list[str]:
+    """Return the measures of the current results more than tolerance worse than the baseline."""
+    regressions: list[str] = []
+    for case, measures in current["results"].items():
+        baseline_measures: Optional[dict[str, float]] = baseline["results"].get(case)
+        if baseline_measures is None:
+            continue
+        for measure, value in measures.items():
+            baseline_value: Optional[float] = baseline_measures.get(measure)
+            if baseline_value and value > baseline_value * (1 + tolerance):
+                regressions.append(f"{case} {measure}: {baseline_value:.4g} -> {value:.4g}")
+    return regressions
+
+
+def main() -> None:
+    """Run the benchmarks, store the results and exit with an error if there are regressions."""
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"))
+    parser.add_argument("--baseline", type=Path, help="results of a previous run to compare with")
+    parser.add_argument("--station-years", type=int, nargs="+", default=list(STATION_YEARS))
+    parser.add_argument("--missing-rates", type=float, nargs="+", default=list(MISSING_RATES))
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args: argparse.Namespace = parser.parse_args()
+
+    # The missing values of the synthetic files would be reported for every run.
+    logging.disable(logging.WARNING)
+    current: dict[str, Any] = run_benchmarks(tuple(args.station_years), tuple(args.missing_rates), args.repeats)
+    args.output.write_text(json.dumps(current, indent=4), encoding="utf-8")
+    print(json.dumps(current["results"], indent=4))
+
+    if args.baseline is not None:
+        baseline: dict[str, Any] = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions: list[str] = compare_results(baseline, current, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    matplotlib.use("Agg")
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+"""
+This module defines the functions to read NOAA GHCN-Daily .dly files, so the
+'WeatherDataPlotter' class can plot them without converting them to CSV first.
+
+The functions allow to:
+- Memory-map a .dly file and view it as a NumPy array of fixed-width records.
+- Decode the values of the requested elements (TMAX, TMIN, PRCP...) by their offsets.
+- Spread the monthly records into daily series, with NaN for the missing values.
+- Look up the station name in a ghcnd-stations.txt file next to the .dly file.
+"""
+
+from pathlib import Path
+import mmap
+
+import numpy as np
+
+# The layout of a .dly record: one station, month and element per line.
+RECORD_WIDTH: int = 269
+ID_SLICE: slice = slice(0, 11)
+YEAR_SLICE: slice = slice(11, 15)
+MONTH_SLICE: slice = slice(15, 17)
+ELEMENT_SLICE: slice = slice(17, 21)
+VALUES_OFFSET: int = 21
+# Each of the 31 days has a 5 characters value and 3 flags.
+DAY_WIDTH: int = 8
+VALUE_WIDTH: int = 5
+DAYS_IN_RECORD: int = 31
+MISSING_VALUE: int = -9999
+STATIONS_FILE: str = "ghcnd-stations.txt"
+STATION_NAME_SLICE: slice = slice(41, 71)
+STATION_STATE_SLICE: slice = slice(38, 40)
+
+
+def read_dly(path: Path, elements: tuple[str, ...]) -> tuple[str, np.ndarray, dict[str, np.ndarray]]:
+    """
+    Read the elements of a .dly file. Return the station id, the dates and the values
+    of each element on those dates, in the units of the file (tenths of °C, tenths of mm...).
+    The file is memory-mapped and decoded with array operations, with no line splitting.
+    """
+    with path.open("rb") as dly_file:
+        if path.stat().st_size < RECORD_WIDTH:
+            raise ValueError(f"{path} has no GHCN-Daily records.")
+        with mmap.mmap(dly_file.fileno(), 0, access=mmap.ACCESS_READ) as dly_map:
+            records: np.ndarray = _records_view(np.frombuffer(dly_map, dtype=np.uint8))
+            station_id: str = records[0, ID_SLICE].tobytes().decode("ascii")
+            element_records: dict[str, np.ndarray] = {
+                # Fancy indexing copies the records, so the map can be closed afterwards.
+                element: records[_element_mask(records, element)]
+                for element in elements
+            }
+            del records
+
+    element_dates: dict[str, np.ndarray] = {}
+    element_values: dict[str, np.ndarray] = {}
+    for element, chosen_records in element_records.items():
+        element_dates[element], element_values[element] = _daily_values(chosen_records)
+
+    # The dates of any element, with NaN for the elements without a value on a date.
+    dates: np.ndarray = np.unique(np.concatenate([np.empty(0, dtype="datetime64[D]"), *element_dates.values()]))
+    values: dict[str, np.ndarray] = {}
+    for element in elements:
+        values[element] = np.full(len(dates), np.nan)
+        values[element][np.searchsorted(dates, element_dates[element])] = element_values[element]
+    return station_id, dates, values
+
+
+def station_name(path: Path, station_id: str) -> str:
+    """
+    Return the name of the station as "NAME, STATE" from the ghcnd-stations.txt file
+    next to the .dly file, or "ID, COUNTRY" if the station can't be found there.
+    """
+    stations_path: Path = path.with_name(STATIONS_FILE)
+    if stations_path.exists():
+        with stations_path.open(encoding="utf-8") as stations_file:
+            for line in stations_file:
+                if line.startswith(station_id):
+                    name: str = line[STATION_NAME_SLICE].strip()
+                    state: str = line[STATION_STATE_SLICE].strip()
+                    return f"{name}, {state or station_id[:2]}"
+    return f"{station_id}, {station_id[:2]}"
+
+
+def _records_view(data: np.ndarray) -> np.ndarray:
+    """
+    Return a (records, RECORD_WIDTH) view of the file bytes, without copying them.
+    The record length is taken from the first line, so both \\n and \\r\\n files work.
+    """
+    newlines: np.ndarray = np.flatnonzero(data[: RECORD_WIDTH + 2] == ord("\n"))
+    record_length: int = int(newlines[0]) + 1 if len(newlines) else len(data)
+    # The last record may have no line ending.
+    n_records: int = (len(data) - RECORD_WIDTH) // record_length + 1
+    return np.lib.stride_tricks.as_strided(
+        data, shape=(n_records, RECORD_WIDTH), strides=(record_length, 1), writeable=False
+    )
+
+
+def _element_mask(records: np.ndarray, element: str) -> np.ndarray:
+    """Return the mask of the records of the element."""
+    code: np.ndarray = np.frombuffer(element.encode("ascii").ljust(4), dtype=np.uint8)
+    return (records[:, ELEMENT_SLICE] == code).all(axis=1)
+
+
+def _decode_integers(chars: np.ndarray) -> np.ndarray:
+    """Decode right-aligned fixed-width integers, such as b"  -12", along the last axis."""
+    digits: np.ndarray = chars.astype(np.int64) - ord("0")
+    is_digit: np.ndarray = (digits >= 0) & (digits <= 9)
+    powers: np.ndarray = 10 ** np.arange(chars.shape[-1] - 1, -1, -1)
+    magnitudes: np.ndarray = (np.where(is_digit, digits, 0) * powers).sum(axis=-1)
+    return np.where((chars == ord("-")).any(axis=-1), -magnitudes, magnitudes)
+
+
+def _daily_values(records: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Spread the monthly records into the dates and values of their days, NaN if missing."""
+    years: np.ndarray = _decode_integers(records[:, YEAR_SLICE])
+    months: np.ndarray = _decode_integers(records[:, MONTH_SLICE])
+    month_starts: np.ndarray = ((years - 1970) * 12 + months - 1).astype("datetime64[M]")
+
+    day_columns: np.ndarray = VALUES_OFFSET + DAY_WIDTH * np.arange(DAYS_IN_RECORD)[:, None] + np.arange(VALUE_WIDTH)
+    values: np.ndarray = _decode_integers(records[:, day_columns]).astype(np.float64)
+    values[values == MISSING_VALUE] = np.nan
+
+    days: np.ndarray = np.arange(DAYS_IN_RECORD).astype("timedelta64[D]")
+    dates: np.ndarray = month_starts.astype("datetime64[D]")[:, None] + days
+    # The records always have 31 days, drop the ones past the end of their month.
+    in_month: np.ndarray = dates < (month_starts + np.timedelta64(1, "M")).astype("datetime64[D]")[:, None]
+    dates, values = dates[in_month], values[in_month]
+    date_order: np.ndarray = np.argsort(dates, kind="stable")
+    return dates[date_order], values[date_order]
@@ -8,11 +8,12 @@ the low temperatures (C°) for Madrid (SP) in 2023.
 from pathlib import Path
 
 from weather_data_plotter import WeatherDataPlotter as WDP
+from weather_cache import WeatherCache
 
 
 if __name__ == "__main__":
-    # Create a plotter instance.
-    weather_plotter: WDP = WDP(title="Daily Low Temperatures, 2023")
+    # Create a plotter instance that caches the parsed data.
+    weather_plotter: WDP = WDP(title="Daily Low Temperatures, 2023", cache=WeatherCache())
 
     # Add data for Madrid to the plotter dataset.
     path: Path = Path("weather_data", "madrid_weather_2023_c_cm.csv")
@@ -8,11 +8,12 @@ the high and low temperatures (F°) for San Francisco (CA, US) in 2000.
 from pathlib import Path
 
 from weather_data_plotter import WeatherDataPlotter as WDP
+from weather_cache import WeatherCache
 
 
 if __name__ == "__main__":
-    # Create a plotter instance.
-    weather_plotter: WDP = WDP(title="Daily High and Low Temperatures, 2000")
+    # Create a plotter instance that caches the parsed data.
+    weather_plotter: WDP = WDP(title="Daily High and Low Temperatures, 2000", cache=WeatherCache())
 
     # Add data for San Francisco to the plotter dataset.
     path: Path = Path("weather_data", "san_francisco_weather_2000_f_in.csv")
@@ -8,11 +8,12 @@ the high and low temperatures (F°) for Death Valley (CA, US) and Sitka (AK, US)
 from pathlib import Path
 
 from weather_data_plotter import WeatherDataPlotter as WDP
+from weather_cache import WeatherCache
 
 
 if __name__ == "__main__":
-    # Create a plotter instance.
-    weather_plotter: WDP = WDP(title="Daily High and Low Temperatures, 2021")
+    # Create a plotter instance that caches the parsed data.
+    weather_plotter: WDP = WDP(title="Daily High and Low Temperatures, 2021", cache=WeatherCache())
 
     # Add data for Death Valley to the plotter dataset.
     dv_path: Path = Path("weather_data", "death_valley_weather_2021_f_in.csv")
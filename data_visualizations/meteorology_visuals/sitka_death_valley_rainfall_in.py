@@ -8,11 +8,12 @@ the precipitation (inches) for Sitka (AK, US) and Death Valley (CA, US) in 2021.
 from pathlib import Path
 
 from weather_data_plotter import WeatherDataPlotter as WDP
+from weather_cache import WeatherCache
 
 
 if __name__ == "__main__":
-    # Create a plotter instance.
-    weather_plotter: WDP = WDP(title="Daily Precipitation, 2021")
+    # Create a plotter instance that caches the parsed data.
+    weather_plotter: WDP = WDP(title="Daily Precipitation, 2021", cache=WeatherCache())
 
     # Add data for Sitka to the plotter dataset.
     sitka_path: Path = Path("weather_data", "sitka_weather_2021_f_in.csv")
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+"""This module tests the benchmark of the 'WeatherDataPlotter' class to ensure it works as expected."""
+
+from typing import Any
+from pathlib import Path
+
+import numpy as np
+import matplotlib
+import matplotlib.pyplot as plt
+
+from benchmark_weather_data_plotter import make_station_csv, run_benchmarks, compare_results, STEPS
+from weather_data_plotter import WeatherDataPlotter as WDP
+
+
+def test_make_station_csv(tmp_path: Path) -> None:
+    """Test if the synthetic file has a day per row and about the requested missing values."""
+    path: Path = make_station_csv(tmp_path / "station.csv", station_years=4, missing_rate=0.1)
+    weather_plotter: WDP = WDP()
+    weather_plotter.weather_dataset(path, high=True, low=True, precip=True)
+    highs: np.ndarray = weather_plotter.dataset["weather_info"]["highs"]
+
+    assert len(highs) == 4 * 365
+    assert 0.05 < np.isnan(highs).mean() < 0.15
+    assert weather_plotter.dataset["loc_name"] == "BENCHMARK STATION, US"
+
+
+def test_run_benchmarks() -> None:
+    """Test if every step of every case is timed and measured, without touching the pyplot state."""
+    backend: str = matplotlib.get_backend()
+    results: dict[str, Any] = run_benchmarks((1,), (0.0, 0.5), repeats=1)
+
+    assert matplotlib.get_backend() == backend
+    assert not plt.get_fignums()
+
+    assert list(results["results"]) == ["1y-0%missing", "1y-50%missing"]
+    for measures in results["results"].values():
+        assert set(measures) == {f"{step}_{measure}" for step in STEPS for measure in ("s", "peak_mb")}
+        assert all(value > 0 for value in measures.values())
+
+
+def test_compare_results() -> None:
+    """Test if only the measures worse than the tolerance are reported as regressions."""
+    baseline: dict[str, Any] = {"results": {"1y-0%missing": {"parse_s": 1.0, "render_s": 1.0}}}
+    current: dict[str, Any] = {
+        "results": {"1y-0%missing": {"parse_s": 1.1, "render_s": 1.5}, "10y-0%missing": {"parse_s": 9.0}}
+    }
+
+    assert compare_results(baseline, current, tolerance=0.2) == ["1y-0%missing render_s: 1 -> 1.5"]
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+"""This module tests the GHCN-Daily .dly reader to ensure it works as expected."""
+
+from pathlib import Path
+
+import pytest
+import numpy as np
+import matplotlib.pyplot as plt
+
+from ghcn_dly_reader import read_dly, station_name, RECORD_WIDTH
+from weather_cache import WeatherCache as WC
+from weather_data_plotter import WeatherDataPlotter as WDP
+from weather_percentiles import PercentileIndex as PI
+
+STATION_ID: str = "USW00025333"
+
+
+def _record(year: int, month: int, element: str, values: list[int]) -> str:
+    """Return a .dly record of a month, with -9999 for the days past the given values."""
+    values = values + [-9999] * (31 - len(values))
+    return f"{STATION_ID}{year:04d}{month:02d}{element}" + "".join(f"{value:5d}   " for value in values)
+
+
+@pytest.fixture(name="path")
+def path_fixture(tmp_path: Path) -> Path:
+    """A .dly file of February and March 2021, with a missing high, available for all tests."""
+    february_highs: list[int] = [10 * day for day in range(1, 29)]
+    february_highs[4] = -9999
+    records: list[str] = [
+        _record(2021, 2, "TMAX", february_highs),
+        _record(2021, 2, "TMIN", [-5] * 28),
+        _record(2021, 2, "PRCP", [254] * 28),
+        _record(2021, 3, "TMAX", [-123] * 31),
+        _record(2021, 3, "SNOW", [0] * 31),
+    ]
+    path: Path = tmp_path / f"{STATION_ID}.dly"
+    # The last record has no line ending, as in some archives.
+    path.write_text("\n".join(records), encoding="ascii")
+    return path
+
+
+def test_read_dly(path: Path) -> None:
+    """Test if the records are decoded into daily values with NaN for the missing ones."""
+    station_id, dates, values = read_dly(path, ("TMAX", "TMIN"))
+
+    assert station_id == STATION_ID
+    assert len(dates) == 28 + 31
+    assert dates[0] == np.datetime64("2021-02-01") and dates[-1] == np.datetime64("2021-03-31")
+    assert values["TMAX"][0] == 10 and values["TMAX"][-1] == -123
+    assert np.isnan(values["TMAX"][4])
+    assert np.isnan(values["TMIN"][28:]).all()
+    assert len(path.read_text(encoding="ascii").splitlines()[0]) == RECORD_WIDTH
+
+
+def test_station_name(path: Path) -> None:
+    """Test if the station name is looked up next to the file, or made from the station id."""
+    assert station_name(path, STATION_ID) == f"{STATION_ID}, US"
+    station_line: str = f"{STATION_ID}  48.9500 -122.5500   45.1 WA BELLINGHAM INTL AP".ljust(85)
+    path.with_name("ghcnd-stations.txt").write_text(station_line + "\n", encoding="utf-8")
+    assert station_name(path, STATION_ID) == "BELLINGHAM INTL AP, WA"
+
+
+def test_dly_dataset_plotted(path: Path) -> None:
+    """Test if a .dly file is loaded in the dataset scales and plotted without a CSV."""
+    weather_plotter: WDP = WDP(title="GHCN-Daily Test")
+    weather_plotter.weather_dataset(
+        path, high=True, precip=True, color="red", temp_scale="F°", precip_scale="in", columns=("SNOW",)
+    )
+    dataset = weather_plotter.dataset
+
+    assert dataset["weather_info"]["highs"][0] == pytest.approx(33.8)
+    assert dataset["weather_info"]["precipitations"][0] == pytest.approx(1.0)
+    assert np.isnan(dataset["weather_info"]["precipitations"][28:]).all()
+    assert dataset["weather_info"]["SNOW"][28] == 0
+    assert dataset["missing_report"]["highs"]["count"] == 1
+    # Disabling pylint warning for accessing protected members.
+    weather_plotter._make_plot(shade_between=True)  # pylint: disable=W0212
+    assert len(weather_plotter.ax.get_lines()) == 1
+    plt.close("all")
+
+
+def test_dly_scales_cached_apart(path: Path, tmp_path: Path) -> None:
+    """Test if the same .dly file loaded in °F and in °C is cached as two entries."""
+    cache: WC = WC(cache_dir=tmp_path / "cache")
+    fahrenheit_plotter: WDP = WDP(cache=cache)
+    fahrenheit_plotter.weather_dataset(path, high=True, temp_scale="F°")
+    celsius_plotter: WDP = WDP(cache=cache)
+    celsius_plotter.weather_dataset(path, high=True, temp_scale="C°")
+
+    assert fahrenheit_plotter.dataset["weather_info"]["highs"][0] == pytest.approx(33.8)
+    assert celsius_plotter.dataset["weather_info"]["highs"][0] == pytest.approx(1.0)
+    fahrenheit_index: PI = PI.from_dataset(fahrenheit_plotter.dataset, "highs", cache=cache)
+    celsius_index: PI = PI.from_dataset(celsius_plotter.dataset, "highs", cache=cache)
+    assert np.nanmax(fahrenheit_index.thresholds(100)) == pytest.approx(82.4)
+    assert np.nanmax(celsius_index.thresholds(100)) == pytest.approx(28.0)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+"""This module tests the 'WeatherCache' class to ensure it works as expected."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import numpy as np
+
+from weather_cache import WeatherCache as WC
+from weather_data_plotter import WeatherDataPlotter as WDP
+
+
+@pytest.fixture(name="cache")
+def cache_fixture(tmp_path: Path) -> WC:
+    """A cache in a temporary directory available for all tests."""
+    return WC(cache_dir=tmp_path / "cache")
+
+
+@pytest.fixture(name="path")
+def path_fixture() -> Path:
+    """A path object available for all tests."""
+    return Path("weather_data", "death_valley_weather_2021_f_in.csv")
+
+
+def test_dataset_loaded_from_cache(cache: WC, path: Path) -> None:
+    """Test if the second load of the same file comes from the cache and matches the first."""
+    first_plotter: WDP = WDP(cache=cache)
+    first_plotter.weather_dataset(path, high=True, low=True)
+
+    second_plotter: WDP = WDP(cache=cache)
+    # Disabling pylint warning for accessing protected members.
+    with patch.object(second_plotter, "_read_file") as read_file:
+        second_plotter.weather_dataset(path, high=True, low=True)
+        assert not read_file.called, "_read_file was called."
+
+    first, second = first_plotter.dataset, second_plotter.dataset
+    assert second["loc_name"] == first["loc_name"]
+    assert second["high_index"] == first["high_index"]
+    assert np.array_equal(second["dates"], first["dates"])
+    assert np.array_equal(second["weather_info"]["highs"], first["weather_info"]["highs"], equal_nan=True)
+    assert np.array_equal(second["missing"]["highs"], first["missing"]["highs"])
+
+
+def test_requested_columns_in_key(cache: WC, path: Path) -> None:
+    """Test if different requested columns are cached as different entries."""
+    high_key: str = cache.cache_key(path, {"high": True})
+    low_key: str = cache.cache_key(path, {"low": True})
+
+    assert high_key != low_key
+    assert high_key.split("-")[0] == low_key.split("-")[0]
+
+
+def test_invalidate(cache: WC, path: Path) -> None:
+    """Test if the entries of a file get removed."""
+    WDP(cache=cache).weather_dataset(path, high=True)
+    WDP(cache=cache).weather_dataset(path, precip=True)
+
+    assert cache.invalidate(path) == 2
+    assert cache.size() == 0
+
+
+def test_eviction(cache: WC) -> None:
+    """Test if the least recently used entries are evicted when the cache is full."""
+    values: np.ndarray = np.zeros(1000)
+    cache.max_bytes = 2 * values.nbytes + 1000
+    for key in ("a-1", "b-2", "c-3"):
+        cache.store(key, {"values": values})
+
+    assert cache.load("a-1") is None
+    assert cache.load("c-3") is not None
+    assert cache.size() <= cache.max_bytes
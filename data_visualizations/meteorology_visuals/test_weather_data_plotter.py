@@ -4,15 +4,20 @@
 
 from typing import Any, Union
 from pathlib import Path
+import subprocess
+import sys
 from datetime import datetime
 from unittest.mock import patch
 
 import pytest
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.legend import Legend
 
 from weather_data_plotter import WeatherDataPlotter as WDP
 from weather_data_plotter import WeatherDataset as WD
+from weather_data_plotter import StationSpec, RenderJob, render_charts
+from weather_data_plotter import _parse_iso_dates
 
 
 @pytest.fixture(name="weather_plotter")
@@ -85,18 +90,21 @@ def test_exit_if_no_data(
     # Disabling pylint warning for accessing protected members.
     header_row_copy_1: list[str] = header_row.copy()
     header_row_copy_1.remove("DATE")
-    with pytest.raises(SystemExit):
+    with pytest.raises(ValueError):
         weather_plotter._get_data_indices(header_row_copy_1)  # pylint: disable=W0212
     # Disabling pylint warning for accessing protected members.
     header_row_copy_2: list[str] = header_row.copy()
     header_row_copy_2.remove("NAME")
-    with pytest.raises(SystemExit):
+    with pytest.raises(ValueError):
         weather_plotter._get_data_indices(header_row_copy_2)  # pylint: disable=W0212
     # Disabling pylint warning for accessing protected members.
     header_row_copy_3: list[str] = header_row.copy()
     header_row_copy_3.remove("TMAX")
-    with pytest.raises(SystemExit):
+    with pytest.raises(ValueError):
         weather_plotter._get_data_indices(header_row_copy_3)  # pylint: disable=W0212
+    # The LA file has no PRCP column.
+    with pytest.raises(SystemExit):
+        weather_plotter.weather_dataset(Path("weather_data", "los_angeles_weather_2000_f_in.csv"), precip=True)
 
 
 def test_collect_values(dataset: dict[str, Any], first_row: list[str]) -> None:
@@ -104,10 +112,275 @@ def test_collect_values(dataset: dict[str, Any], first_row: list[str]) -> None:
     date: datetime = datetime.strptime(first_row[2], "%Y-%m-%d")
 
     assert dataset["loc_name"] == first_row[1]
-    assert date in dataset["dates"]
+    assert np.datetime64(date, "D") in dataset["dates"]
     assert float(first_row[-2]) in dataset["weather_info"]["highs"]
     assert float(first_row[-1]) not in dataset["weather_info"]["lows"]
-    assert dataset["weather_info"]["lows"] == dataset["weather_info"]["precipitations"] == []
+    assert dataset["weather_info"]["lows"].size == dataset["weather_info"]["precipitations"].size == 0
+
+
+def test_matplotlib_not_imported_for_loading(path: Path) -> None:
+    """Test if making the plotter and loading data don't import matplotlib until a plot is made."""
+    code: str = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "from weather_data_plotter import WeatherDataPlotter\n"
+        f"WeatherDataPlotter().weather_dataset(Path({str(path)!r}), high=True, low=True)\n"
+        "assert 'matplotlib' not in sys.modules, 'matplotlib was imported.'\n"
+    )
+    result: subprocess.CompletedProcess[str] = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=False
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_typed_columns(weather_plotter: WDP) -> None:
+    """Test if the data is stored in typed columns with missing values masked as NaN."""
+    path: Path = Path("weather_data", "death_valley_weather_2021_f_in.csv")
+    weather_plotter.weather_dataset(path, high=True, low=True, float32=True)
+    dataset: WD = weather_plotter.dataset
+    highs: np.ndarray = dataset["weather_info"]["highs"]
+
+    assert dataset["dates"].dtype == np.dtype("datetime64[D]")
+    assert highs.dtype == dataset["weather_info"]["lows"].dtype == np.float32
+    assert len(highs) == len(dataset["dates"])
+    assert dataset["missing"]["highs"].sum() == 1
+    assert np.isnan(highs[dataset["missing"]["highs"]]).all()
+
+
+def test_single_pass_extraction(weather_plotter: WDP) -> None:
+    """Test if all the requested data are extracted at once and can be shared between plots."""
+    path: Path = Path("weather_data", "death_valley_weather_2021_f_in.csv")
+    weather_plotter.weather_dataset(path, high=True, low=True, precip=True, columns=("SNOW",))
+    dataset: WD = weather_plotter.dataset
+
+    for weather_type in ("highs", "lows", "precipitations", "SNOW"):
+        assert dataset["weather_info"][weather_type].size == 365
+    assert dataset["column_indices"] == {"SNOW": 4}
+
+    rain_plotter: WDP = WDP(title="Rain Test")
+    rain_plotter.share_dataset(dataset, precip=True, color="blue", label="Death Valley")
+    assert rain_plotter.dataset["weather_info"]["precipitations"] is dataset["weather_info"]["precipitations"]
+    assert not rain_plotter.dataset["high"]
+    # Disabling pylint warning for accessing protected members.
+    rain_plotter._make_plot(shade_between=False)  # pylint: disable=W0212
+    assert rain_plotter.ax.get_lines()[0].get_label() == "Death Valley Precipitations"
+    plt.close("all")
+
+
+def test_unplottable_dataset_rejected(weather_plotter: WDP) -> None:
+    """Test if datasets without the weather types to plot are rejected with a clear error."""
+    path: Path = Path("weather_data", "death_valley_weather_2021_f_in.csv")
+    weather_plotter.weather_dataset(path, high=True, color="red")
+    with pytest.raises(ValueError, match="precipitations"):
+        WDP().share_dataset(weather_plotter.dataset, precip=True, color="blue")
+
+    snow_plotter: WDP = WDP(title="Snow Test")
+    snow_plotter.weather_dataset(path, columns=("SNOW",))
+    with pytest.raises(ValueError, match="Nothing to plot"):
+        snow_plotter.plot_visual(save_path=Path("snow.png"))
+    plt.close("all")
+
+
+def test_streaming_chunks(weather_plotter: WDP, path: Path, dataset: dict[str, Any]) -> None:
+    """Test if reading the file in small chunks gives the same data and reports the progress."""
+    progress_calls: list[tuple[int, int, int]] = []
+    weather_plotter.weather_dataset(
+        path,
+        high=True,
+        chunk_size=50,
+        progress=lambda rows, read, size: progress_calls.append((rows, read, size)),
+    )
+
+    assert np.array_equal(weather_plotter.dataset["dates"], dataset["dates"])
+    assert np.array_equal(weather_plotter.dataset["weather_info"]["highs"], dataset["weather_info"]["highs"])
+    assert len(progress_calls) == -(-len(dataset["dates"]) // 50)
+    assert progress_calls[-1][0] == len(dataset["dates"])
+    assert progress_calls[-1][1] == progress_calls[-1][2] == path.stat().st_size
+
+
+def test_predicate_pushdown(weather_plotter: WDP, path: Path) -> None:
+    """Test if only the rows in the date range and of the stations are kept."""
+    bytes_read: list[tuple[int, int]] = []
+    weather_plotter.weather_dataset(
+        path,
+        high=True,
+        chunk_size=10,
+        progress=lambda rows, read, size: bytes_read.append((read, size)),
+        start_date="2023-03-01",
+        end_date="2023-03-31",
+        sorted_dates=True,
+    )
+    dates: np.ndarray = weather_plotter.dataset["dates"]
+
+    assert len(dates) == 31
+    assert dates[0] == np.datetime64("2023-03-01") and dates[-1] == np.datetime64("2023-03-31")
+    assert len(weather_plotter.dataset["weather_info"]["highs"]) == 31
+    # The file is sorted, so it stops being read after March.
+    assert bytes_read[-1][0] < bytes_read[-1][1]
+
+    weather_plotter.weather_dataset(path, high=True, stations=("SITKA AIRPORT, AK US",))
+    assert len(weather_plotter.dataset["dates"]) == 0
+
+
+def test_date_parsing(weather_plotter: WDP, tmp_path: Path) -> None:
+    """Test if ISO dates are parsed once per calendar and other formats fall back to strptime."""
+    dates: tuple[str, ...] = ("2023-01-01", "2023-01-02", "2023-01-03")
+    parsed_dates: np.ndarray = _parse_iso_dates(dates)
+    assert parsed_dates[-1] == np.datetime64("2023-01-03")
+    # The same calendar is parsed only once.
+    assert _parse_iso_dates(dates) is parsed_dates
+
+    us_path: Path = tmp_path / "us_dates.csv"
+    us_path.write_text('"NAME","DATE","TMAX"\n"MADRID BARAJAS, SP","01/31/2023","55"\n', encoding="utf-8")
+    weather_plotter.weather_dataset(us_path, high=True, date_format="%m/%d/%Y")
+    assert weather_plotter.dataset["dates"][0] == np.datetime64("2023-01-31")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_load_many_stations(weather_plotter: WDP, workers: int, tmp_path: Path) -> None:
+    """Test if many stations are loaded in order and a missing or misshapen file doesn't stop the others."""
+    short_path: Path = tmp_path / "short_rows.csv"
+    short_path.write_text('"NAME","DATE","TMAX"\n"SITKA AIRPORT, AK US","2021-01-01","50"\n"SITKA"\n', encoding="utf-8")
+    empty_path: Path = tmp_path / "empty.csv"
+    empty_path.write_text("", encoding="utf-8")
+    specs: list[StationSpec] = [
+        {"path": Path("weather_data", "sitka_weather_2021_f_in.csv"), "high": True, "label": "Sitka"},
+        {"path": Path("weather_data", "foo.csv"), "high": True},
+        {"path": short_path, "high": True},
+        {"path": empty_path, "high": True},
+        {"path": Path("weather_data", "death_valley_weather_2021_f_in.csv"), "precip": True},
+    ]
+    datasets: list[WD] = weather_plotter.weather_datasets(specs, workers=workers)
+
+    assert [dataset["path"] for dataset in datasets] == [specs[0]["path"], specs[4]["path"]]
+    assert weather_plotter.datasets == datasets
+    assert datasets[0]["label"] == "Sitka"
+    assert datasets[0]["weather_info"]["highs"].size == 365
+    assert datasets[1]["weather_info"]["precipitations"].size == 365
+    assert list(weather_plotter.load_errors) == [spec["path"] for spec in specs[1:4]]
+    assert weather_plotter.load_errors[short_path].startswith("IndexError")
+
+
+@pytest.mark.parametrize("how, n_dates", [("outer", 365), ("inner", 31)])
+def test_align_datasets(weather_plotter: WDP, how: str, n_dates: int) -> None:
+    """Test if the datasets share one date index and can be compared with array operations."""
+    sitka_path: Path = Path("weather_data", "sitka_weather_2021_f_in.csv")
+    weather_plotter.weather_dataset(sitka_path, high=True, end_date="2021-01-31")
+    weather_plotter.weather_dataset(Path("weather_data", "death_valley_weather_2021_f_in.csv"), high=True)
+    date_index: np.ndarray = weather_plotter.align_datasets(how)  # type: ignore
+
+    assert len(date_index) == n_dates
+    assert all(dataset["dates"] is date_index for dataset in weather_plotter.datasets)
+    highs: np.ndarray = weather_plotter.station_matrix("highs")
+    assert highs.shape == (2, n_dates)
+    differences: np.ndarray = highs[1] - highs[0]
+    assert np.isnan(differences[31:]).all()
+    assert differences[0] == highs[1][0] - highs[0][0]
+
+
+def test_render_charts(tmp_path: Path) -> None:
+    """Test if a batch of charts is rendered to files and a failing chart is reported."""
+    jobs: list[RenderJob] = [
+        {
+            "save_path": tmp_path / f"sitka.{suffix}",
+            "stations": [{"path": Path("weather_data", "sitka_weather_2021_f_in.csv"), "high": True, "low": True}],
+            "title": "Sitka",
+        }
+        for suffix in ("png", "svg", "pdf")
+    ]
+    jobs.append({"save_path": tmp_path / "foo.png", "stations": [{"path": Path("foo.csv"), "high": True}]})
+    render_errors: dict[Path, str] = render_charts(jobs, workers=2)
+
+    assert all(job["save_path"].stat().st_size > 0 for job in jobs[:3])
+    assert list(render_errors) == [tmp_path / "foo.png"]
+
+
+def test_render_charts_in_process(tmp_path: Path) -> None:
+    """Test if the charts rendered in this process leave pyplot untouched and a failing save is reported."""
+    jobs: list[RenderJob] = [
+        {
+            "save_path": tmp_path / f"sitka.{suffix}",
+            "stations": [{"path": Path("weather_data", "sitka_weather_2021_f_in.csv"), "high": True, "color": "red"}],
+        }
+        for suffix in ("png", "foo")
+    ]
+    plt.close("all")
+    with patch("matplotlib.pyplot.switch_backend") as switch_backend:
+        render_errors: dict[Path, str] = render_charts(jobs, workers=1)
+
+    assert not switch_backend.called
+    assert not plt.get_fignums()
+    assert (tmp_path / "sitka.png").stat().st_size > 0
+    assert list(render_errors) == [tmp_path / "sitka.foo"]
+    assert render_errors[tmp_path / "sitka.foo"].startswith("ValueError")
+
+
+def test_plot_grid(weather_plotter: WDP, tmp_path: Path) -> None:
+    """Test if each station gets a panel with a single collection for its lines and one for its fill."""
+    file_names: list[str] = ["sitka_weather_2021_f_in.csv", "death_valley_weather_2021_f_in.csv"] * 3
+    weather_plotter.weather_datasets(
+        [{"path": Path("weather_data", file_name), "high": True, "low": True} for file_name in file_names],
+        workers=1,
+    )
+    weather_plotter.plot_grid(n_cols=4, save_path=tmp_path / "grid.png")
+    axes: list[plt.Axes] = weather_plotter.grid_fig.axes  # type: ignore
+
+    assert len(axes) == 8
+    assert [panel_ax.get_visible() for panel_ax in axes] == [True] * 6 + [False] * 2
+    assert all(len(panel_ax.collections) == 2 and not panel_ax.get_lines() for panel_ax in axes[:6])
+    assert axes[1].get_title() == "Death Valley National Park, CA US"
+    assert (tmp_path / "grid.png").stat().st_size > 0
+    plt.close("all")
+
+
+@pytest.mark.parametrize("downsample", ["minmax", "lttb"])
+def test_downsample(weather_plotter: WDP, tmp_path: Path, downsample: str) -> None:
+    """Test if a long series is reduced before plotting and keeps its extremes."""
+    days: int = 20_000
+    rng: np.random.Generator = np.random.default_rng(0)
+    dates: np.ndarray = np.arange(np.datetime64("1900-01-01"), np.datetime64("1900-01-01") + np.timedelta64(days, "D"))
+    highs: np.ndarray = rng.normal(70, 15, days).round(1)
+    rows: list[str] = [f'"SITKA AIRPORT, AK US","{date}","{high}"' for date, high in zip(dates, highs)]
+    path: Path = tmp_path / "long_series.csv"
+    path.write_text('"NAME","DATE","TMAX"\n' + "\n".join(rows), encoding="utf-8")
+
+    weather_plotter.weather_dataset(path, high=True, color="red")
+    # Disabling pylint warning for accessing protected members.
+    weather_plotter._make_plot(shade_between=True, downsample=downsample)  # type: ignore  # pylint: disable=W0212
+    line_values: np.ndarray = weather_plotter.ax.get_lines()[0].get_ydata()  # type: ignore
+
+    assert len(line_values) < days // 5
+    assert line_values.max() == highs.max()
+    if downsample == "minmax":
+        assert line_values.min() == highs.min()
+    plt.close("all")
+
+
+def test_missing_data_report(weather_plotter: WDP, caplog: pytest.LogCaptureFixture) -> None:
+    """Test if the missing values are counted once per dataset instead of logged per row."""
+    path: Path = Path("weather_data", "death_valley_weather_2021_f_in.csv")
+    with caplog.at_level("WARNING"):
+        weather_plotter.weather_dataset(path, high=True, low=True)
+
+    report: dict[str, Any] = weather_plotter.dataset["missing_report"]
+    assert list(report) == ["highs"]
+    assert report["highs"]["count"] == 1
+    assert report["highs"]["date_ranges"] == [(np.datetime64("2021-05-04"), np.datetime64("2021-05-04"))]
+    assert len(caplog.records) == 1
+
+
+@pytest.mark.parametrize("gaps, n_points", [("break", 365), ("interpolate", 365), ("drop", 364)])
+def test_gaps(weather_plotter: WDP, gaps: str, n_points: int) -> None:
+    """Test if the missing values are left, interpolated or dropped before plotting."""
+    path: Path = Path("weather_data", "death_valley_weather_2021_f_in.csv")
+    weather_plotter.weather_dataset(path, high=True, low=True, color="red")
+    # Disabling pylint warning for accessing protected members.
+    weather_plotter._make_plot(shade_between=True, gaps=gaps)  # type: ignore  # pylint: disable=W0212
+    line_values: np.ndarray = weather_plotter.ax.get_lines()[0].get_ydata()  # type: ignore
+
+    assert len(line_values) == n_points
+    assert np.isnan(line_values).any() == (gaps == "break")
+    plt.close("all")
 
 
 def test_does_it_plot(weather_plotter: WDP, dataset: dict[str, Any]) -> None:  # pylint: disable=W0613
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+"""This module tests the 'PercentileIndex' class to ensure it works as expected."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import numpy as np
+import matplotlib.pyplot as plt
+
+from weather_cache import WeatherCache as WC
+from weather_data_plotter import WeatherDataPlotter as WDP
+from weather_data_plotter import WeatherDataset as WD
+from weather_percentiles import PercentileIndex as PI
+from weather_statistics import day_of_year
+
+
+@pytest.fixture(name="weather_plotter")
+def weather_plotter_fixture(tmp_path: Path) -> WDP:
+    """A plotter with 20 years of random highs, some missing, available for all tests."""
+    days: int = 20 * 365
+    rng: np.random.Generator = np.random.default_rng(0)
+    dates: np.ndarray = np.datetime64("2000-01-01") + np.arange(days).astype("timedelta64[D]")
+    highs: list[str] = [str(high) for high in rng.normal(60, 12, days).round(1)]
+    for missing in rng.choice(days, 50, replace=False):
+        highs[missing] = ""
+    rows: list[str] = [f'"SITKA AIRPORT, AK US","{date}","{high}"' for date, high in zip(dates, highs)]
+    path: Path = tmp_path / "sitka_highs.csv"
+    path.write_text('"NAME","DATE","TMAX"\n' + "\n".join(rows), encoding="utf-8")
+
+    weather_plotter: WDP = WDP(title="Percentiles Test")
+    weather_plotter.weather_dataset(path, high=True, color="red")
+    return weather_plotter
+
+
+@pytest.fixture(name="dataset")
+def dataset_fixture(weather_plotter: WDP) -> WD:
+    """The dataset of the random highs available for all tests."""
+    return weather_plotter.dataset
+
+
+def _scan(dataset: WD, percentile: float) -> tuple[np.ndarray, np.ndarray]:
+    """Return the thresholds and the days above them, found with a full scan of the data."""
+    highs: np.ndarray = dataset["weather_info"]["highs"]
+    days: np.ndarray = day_of_year(dataset["dates"])
+    thresholds: np.ndarray = np.array([np.nanpercentile(highs[days == day], percentile) for day in range(366)])
+    return thresholds, dataset["dates"][highs > thresholds[days]]
+
+
+def test_beyond_percentile(dataset: WD) -> None:
+    """Test if the thresholds and the days above them match a full scan of the data."""
+    percentile_index: PI = PI.from_dataset(dataset, "highs")
+    thresholds, scanned_dates = _scan(dataset, 95)
+    dates, values = percentile_index.beyond_percentile(95)
+
+    assert np.allclose(percentile_index.thresholds(95), thresholds)
+    assert np.array_equal(dates, scanned_dates)
+    assert (np.diff(dates) > np.timedelta64(0, "D")).all()
+    assert (values > percentile_index.thresholds(95)[day_of_year(dates)]).all()
+    low_dates, _ = percentile_index.beyond_percentile(5, above=False)
+    low_thresholds: np.ndarray = percentile_index.thresholds(5)
+    highs: np.ndarray = dataset["weather_info"]["highs"]
+    assert np.array_equal(low_dates, dataset["dates"][highs < low_thresholds[day_of_year(dataset["dates"])]])
+
+
+def test_anomalies_and_records(dataset: WD) -> None:
+    """Test if the anomalies and the records match a full scan of the data."""
+    highs: np.ndarray = dataset["weather_info"]["highs"]
+    percentile_index: PI = PI.from_dataset(dataset, "highs")
+
+    _, anomalies = percentile_index.anomalies(25)
+    assert len(anomalies) and (anomalies > 25).all()
+    dates, records = percentile_index.records()
+    assert len(dates) == 366
+    assert records.max() == np.nanmax(highs)
+    _, lowest_records = percentile_index.records(highest=False)
+    assert lowest_records.min() == np.nanmin(highs)
+
+
+def test_index_persisted(dataset: WD, tmp_path: Path) -> None:
+    """Test if the index is built once and loaded from the cache afterwards."""
+    cache: WC = WC(cache_dir=tmp_path / "cache")
+    first_index: PI = PI.from_dataset(dataset, "highs", cache=cache)
+    with patch.object(PI, "__init__") as init:
+        second_index: PI = PI.from_dataset(dataset, "highs", cache=cache)
+        assert not init.called, "The index was built again."
+
+    assert np.array_equal(second_index.beyond_percentile(90)[0], first_index.beyond_percentile(90)[0])
+
+
+def test_highlights_plotted(weather_plotter: WDP, dataset: WD) -> None:
+    """Test if the extreme days are marked on the plot of the dataset."""
+    dates, values = PI.from_dataset(dataset, "highs").records()
+    weather_plotter.add_highlight(dates, values, label="Records")
+    # Disabling pylint warning for accessing protected members.
+    weather_plotter._make_plot(shade_between=False)  # pylint: disable=W0212
+
+    assert [collection.get_label() for collection in weather_plotter.ax.collections] == ["Records"]
+    plt.close("all")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+"""This module tests the 'WeatherStatistics' class to ensure it works as expected."""
+
+from pathlib import Path
+
+import pytest
+import numpy as np
+
+from weather_data_plotter import WeatherDataPlotter as WDP
+from weather_data_plotter import WeatherDataset as WD
+from weather_statistics import WeatherStatistics as WS
+from weather_statistics import day_of_year
+
+
+@pytest.fixture(name="weather_plotter")
+def weather_plotter_fixture() -> WDP:
+    """A plotter with the Sitka highs available for all tests."""
+    weather_plotter: WDP = WDP(title="Statistics Test")
+    weather_plotter.weather_dataset(Path("weather_data", "sitka_weather_2021_f_in.csv"), high=True, color="red")
+    return weather_plotter
+
+
+@pytest.fixture(name="dataset")
+def dataset_fixture(weather_plotter: WDP) -> WD:
+    """The Sitka dataset available for all tests."""
+    return weather_plotter.dataset
+
+
+def test_day_of_year() -> None:
+    """Test if every calendar day keeps the same day of year in common and leap years."""
+    dates: np.ndarray = np.array(["2021-01-01", "2021-03-01", "2024-02-29", "2024-03-01", "2021-12-31"])
+    assert list(day_of_year(dates.astype("datetime64[D]"))) == [0, 60, 59, 60, 365]
+
+
+def test_statistics(dataset: WD) -> None:
+    """Test if the statistics match the ones computed directly from the data."""
+    highs: np.ndarray = dataset["weather_info"]["highs"]
+    statistics: WS = WS.from_dataset(dataset, "highs", window=7)
+
+    _, rolling_means = statistics.rolling_mean()
+    assert rolling_means[6] == pytest.approx(np.mean(highs[:7]))
+    months, monthly_means = statistics.monthly_means()
+    assert len(months) == 12
+    assert monthly_means[0] == pytest.approx(np.mean(highs[:31]))
+    _, yearly_means = statistics.yearly_means()
+    assert yearly_means[0] == pytest.approx(np.nanmean(highs))
+    assert statistics.normals()[0] == highs[0]
+
+
+def test_incremental_update(dataset: WD) -> None:
+    """Test if appending days one at a time gives the same statistics as adding them at once."""
+    dates: np.ndarray = dataset["dates"]
+    highs: np.ndarray = dataset["weather_info"]["highs"]
+    statistics: WS = WS(window=30)
+    statistics.extend(dates[:200], highs[:200])
+    for date, high in zip(dates[200:], highs[200:]):
+        statistics.append(date, high)
+    bulk_statistics: WS = WS.from_dataset(dataset, "highs", window=30)
+
+    assert np.allclose(statistics.rolling_mean()[1], bulk_statistics.rolling_mean()[1], equal_nan=True)
+    assert np.allclose(statistics.monthly_means()[1], bulk_statistics.monthly_means()[1], equal_nan=True)
+    assert np.allclose(statistics.normals(), bulk_statistics.normals(), equal_nan=True)
+
+
+def test_unordered_dates_rejected(dataset: WD) -> None:
+    """Test if dates that are unsorted or not after the last added day are rejected."""
+    dates: np.ndarray = dataset["dates"]
+    highs: np.ndarray = dataset["weather_info"]["highs"]
+    statistics: WS = WS()
+    with pytest.raises(ValueError):
+        statistics.extend(dates[[1, 0]], highs[:2])
+    statistics.extend(dates[10:20], highs[10:20])
+    with pytest.raises(ValueError):
+        statistics.extend(dates[:10], highs[:10])
+    with pytest.raises(ValueError):
+        statistics.append(dates[19], highs[19])
+    assert statistics.size == 10
+    assert statistics.monthly_means()[1][0] == pytest.approx(np.mean(highs[10:20]))
+
+
+def test_overlay_plotted(weather_plotter: WDP, dataset: WD, tmp_path: Path) -> None:
+    """Test if the statistics are plotted as overlays."""
+    statistics: WS = WS.from_dataset(dataset, "highs", window=30)
+    weather_plotter.add_overlay(*statistics.rolling_mean(), label="30-Day Mean")
+    weather_plotter.plot_visual(save_path=tmp_path / "overlay.png")
+
+    labels: list[str] = [str(line.get_label()) for line in weather_plotter.ax.get_lines()]
+    assert "30-Day Mean" in labels
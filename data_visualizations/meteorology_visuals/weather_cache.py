@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+"""
+This module defines the 'WeatherCache' class to keep the parsed weather datasets
+on disk, so the CSV files don't need to be parsed again on every run.
+
+The class allows to:
+- Store the parsed columns of a weather file in a binary .npz file.
+- Load them back, keyed on the file path, size, modification time and requested columns.
+- Bound the size of the cache by evicting the least recently used entries.
+- Invalidate the entries of a single file or of the whole cache.
+"""
+
+from pathlib import Path
+from typing import Any, Optional
+import hashlib
+import json
+import logging
+import os
+
+import numpy as np
+
+CACHE_DIR: Path = Path("weather_data", ".weather_cache")
+CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+CACHE_VERSION: int = 1
+
+
+class WeatherCache:
+    """Keep the parsed weather datasets in a size-bounded directory of .npz files."""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES) -> None:
+        """Initialize the cache attributes."""
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def cache_key(self, path: Path, columns: dict[str, Any]) -> str:
+        """Return the key of a weather file for the given requested columns."""
+        stat: os.stat_result = path.stat()
+        key_data: dict[str, Any] = {
+            "version": CACHE_VERSION,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "columns": columns,
+        }
+        key_hash: str = hashlib.sha1(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+        # The entries of the same file share a prefix, so they can be invalidated together.
+        return f"{self._path_prefix(path)}-{key_hash[:16]}"
+
+    def load(self, key: str) -> Optional[dict[str, np.ndarray]]:
+        """Return the cached arrays for the key, or None if they are not cached."""
+        entry: Path = self._entry_path(key)
+        try:
+            with np.load(entry, allow_pickle=False) as npz_file:
+                arrays: dict[str, np.ndarray] = {name: npz_file[name] for name in npz_file.files}
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+
+        # Mark the entry as recently used for the eviction policy.
+        entry.touch()
+        return arrays
+
+    def store(self, key: str, arrays: dict[str, np.ndarray]) -> None:
+        """Store the arrays under the key and evict old entries if the cache is too big."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry: Path = self._entry_path(key)
+        # Write to a temporary file first, so readers never see a partial entry.
+        temp_entry: Path = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        try:
+            with temp_entry.open("wb") as temp_file:
+                np.savez(temp_file, **arrays)  # type: ignore[arg-type]
+            temp_entry.replace(entry)
+        except OSError as ose:
+            logging.error("Could not cache %s: %s", key, ose)
+            temp_entry.unlink(missing_ok=True)
+        else:
+            self._evict()
+
+    def invalidate(self, path: Optional[Path] = None) -> int:
+        """Remove the entries of the weather file, or all entries if no path is given."""
+        pattern: str = f"{self._path_prefix(path)}-*.npz" if path is not None else "*.npz"
+        removed: int = 0
+        for entry in self.cache_dir.glob(pattern):
+            entry.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    def size(self) -> int:
+        """Return the total size of the cache in bytes."""
+        return sum(entry.stat().st_size for entry in self.cache_dir.glob("*.npz"))
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until the cache fits in max_bytes."""
+        entries: list[tuple[float, int, Path]] = []
+        for entry in self.cache_dir.glob("*.npz"):
+            try:
+                stat: os.stat_result = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total_bytes: int = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total_bytes -= size
+
+    def _entry_path(self, key: str) -> Path:
+        """Return the path of the cache entry for the key."""
+        return self.cache_dir / f"{key}.npz"
+
+    @staticmethod
+    def _path_prefix(path: Path) -> str:
+        """Return the prefix shared by all the entries of a weather file."""
+        return hashlib.sha1(str(Path(path).resolve()).encode()).hexdigest()[:16]
@@ -5,21 +5,45 @@ This module defines the 'WeatherDataPlotter' class to analyze, plot and visualiz
 weather data using matplotlib.pyplot.
 
 The class allows to:
-- Import weather data from CSV files.
-- Extract and process high and low temperatures, as well as precipitation data.
+- Import weather data from CSV files, streaming them in chunks of rows.
+- Import NOAA GHCN-Daily .dly files directly, with a memory-mapped fixed-width reader.
+- Keep only the rows in a date range or of some stations, filtered before any conversion.
+- Optionally cache the parsed data on disk with a 'WeatherCache'.
+- Load many stations concurrently in a pool of worker processes.
+- Align the stations to a shared date index, to compare them with array operations.
+- Render batches of charts to PNG, SVG or PDF files without a display.
+- Draw overlay series, such as the statistics of a 'WeatherStatistics', over the data.
+- Mark days, such as the extremes found by a 'PercentileIndex', on the plot of a dataset.
+- Extract high and low temperatures, precipitation and any extra NOAA column in a single pass.
+- Store the data as typed NumPy columns, with missing values as NaN and reported once per file.
 - Generate and customize plots to visualize the data.
+- Plot many stations as a grid of small multiples with shared axes.
 """
 
 import sys
-from typing import TypedDict, Literal, Iterator, Optional, Union
+import os
+import io
+from typing import TypedDict, Literal, Iterator, Optional, Union, Callable, TYPE_CHECKING
 from pathlib import Path
 import csv
+import math
+from itertools import islice
+from functools import lru_cache, reduce
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import logging
 
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib.figure import Figure
+import numpy as np
+
+from weather_cache import WeatherCache
+from ghcn_dly_reader import read_dly, station_name
+
+# matplotlib is imported by the methods making a plot, so loading data never starts it.
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
+    from matplotlib.dates import AutoDateLocator
 
 logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s")
 logging.disable(logging.DEBUG)
@@ -28,13 +52,44 @@ FONT_SIZE_TITLE: int = 11
 FONT_SIZE_LABELS: int = 10
 FONT_SIZE_TICKS: int = 9
 FONT_SIZE_LEGEND: int = 8
+GRID_PANEL_SIZE: tuple[float, float] = (3.5, 2.2)
 DATE_FORMAT: str = "%Y-%m-%d"
+DATE_CACHE_SIZE: int = 64
+WEATHER_TYPES: tuple[str, ...] = ("highs", "lows", "precipitations")
+COLUMN_CAPACITY: int = 1024
+CHUNK_SIZE: int = 65_536
+INDEX_NAMES: tuple[str, ...] = ("date_index", "name_index", "high_index", "low_index", "precip_index")
+# The GHCN-Daily elements of the weather data columns, in tenths of °C and tenths of mm.
+DLY_ELEMENTS: dict[str, str] = {"highs": "TMAX", "lows": "TMIN", "precipitations": "PRCP"}
+
+ProgressCallback = Callable[[int, int, int], None]
+Downsampling = Literal["minmax", "lttb"]
+Gaps = Literal["break", "interpolate", "drop"]
+Join = Literal["outer", "inner"]
+
+
+class MissingReport(TypedDict):
+    """A TypedDict describing the missing values of a weather data column."""
+
+    count: int
+    date_ranges: list[tuple[np.datetime64, np.datetime64]]
+
+
+class Highlight(TypedDict):
+    """A TypedDict describing days marked on the plot of a dataset, such as extreme days."""
+
+    dates: np.ndarray
+    values: np.ndarray
+    label: str
+    color: str
+    marker: str
 
 
 class WeatherDataset(TypedDict):
     """A TypedDict used as a type annotation class to describe the weather dataset."""
 
     path: Path
+    date_format: str
     high: bool
     low: bool
     precip: bool
@@ -43,30 +98,230 @@ class WeatherDataset(TypedDict):
     label: str
     temp_scale: Literal["C°", "F°"]
     precip_scale: Literal["cm", "in"]
-    dates: list[datetime]
+    float32: bool
+    columns: tuple[str, ...]
+    start_date: str
+    end_date: str
+    stations: tuple[str, ...]
+    sorted_dates: bool
+    dates: np.ndarray
     loc_name: str
-    weather_info: dict[str, list[float]]
+    weather_info: dict[str, np.ndarray]
+    missing: dict[str, np.ndarray]
+    missing_report: dict[str, MissingReport]
+    highlights: list[Highlight]
     date_index: int
     name_index: int
     high_index: int
     low_index: int
     precip_index: int
+    column_indices: dict[str, int]
+
+
+# Parsed chunks of ISO dates, keyed on a fingerprint of their strings.
+_iso_dates_cache: OrderedDict[tuple[int, str, str, int], np.ndarray] = OrderedDict()
+
+
+def _parse_iso_dates(date_strings: tuple[str, ...]) -> np.ndarray:
+    """
+    Parse a chunk of ISO dates into datetime64 in one vectorized step.
+    The result is cached, so stations sharing the same calendar parse it only once.
+    """
+    key: tuple[int, str, str, int] = (len(date_strings), date_strings[0], date_strings[-1], hash(date_strings))
+    if key in _iso_dates_cache:
+        _iso_dates_cache.move_to_end(key)
+        return _iso_dates_cache[key]
 
+    dates: np.ndarray = np.array(date_strings, dtype="datetime64[D]")
+    # The array is shared between the cache hits, so it must not be modified.
+    dates.flags.writeable = False
+    _iso_dates_cache[key] = dates
+    if len(_iso_dates_cache) > DATE_CACHE_SIZE:
+        _iso_dates_cache.popitem(last=False)
+    return dates
 
-class WeatherDataPlotter:
+
+@lru_cache(maxsize=CHUNK_SIZE)
+def _parse_date(date_string: str, date_format: str) -> datetime:
+    """Parse a single date with strptime. Used for the dates not in ISO format."""
+    return datetime.strptime(date_string, date_format)
+
+
+def clear_date_caches() -> None:
+    """Forget the parsed dates, so the next files are parsed as in a new process."""
+    _iso_dates_cache.clear()
+    _parse_date.cache_clear()
+
+
+class StationSpec(TypedDict, total=False):
+    """A TypedDict describing the arguments used to load a station with weather_datasets."""
+
+    path: Path
+    high: bool
+    low: bool
+    precip: bool
+    color: str
+    alpha: float
+    label: str
+    temp_scale: Literal["C°", "F°"]
+    precip_scale: Literal["cm", "in"]
+    float32: bool
+    date_format: str
+    columns: tuple[str, ...]
+    start_date: str
+    end_date: str
+    stations: tuple[str, ...]
+    sorted_dates: bool
+
+
+class Overlay(TypedDict):
+    """A TypedDict describing a series drawn over the datasets, such as a rolling mean."""
+
+    dates: np.ndarray
+    values: np.ndarray
+    label: str
+    color: str
+    linestyle: str
+
+
+class RenderJob(TypedDict, total=False):
+    """A TypedDict describing a chart rendered to a file by render_charts."""
+
+    save_path: Path
+    stations: list[StationSpec]
+    title: str
+    title_color: str
+    shade_between: bool
+    y_limit: Optional[tuple[Union[float, int], Union[float, int]]]
+    downsample: Optional[Downsampling]
+    gaps: Gaps
+    grid: bool
+    n_cols: Optional[int]
+
+
+def _minmax_indices(dates: np.ndarray, values: np.ndarray, n_buckets: int) -> np.ndarray:
+    """Return the indices of the minimum and maximum of each bucket of values."""
+    bucket_size: int = -(-len(values) // n_buckets)
+    buckets: np.ndarray = np.full(-(-len(values) // bucket_size) * bucket_size, np.nan)
+    buckets[: len(values)] = values
+    buckets = buckets.reshape(-1, bucket_size)
+    missing: np.ndarray = np.isnan(buckets)
+
+    offsets: np.ndarray = np.arange(len(buckets)) * bucket_size
+    min_indices: np.ndarray = offsets + np.where(missing, np.inf, buckets).argmin(axis=1)
+    max_indices: np.ndarray = offsets + np.where(missing, -np.inf, buckets).argmax(axis=1)
+    indices: np.ndarray = np.concatenate([[0, len(dates) - 1], min_indices, max_indices])
+    return np.unique(indices[indices < len(values)])
+
+
+def _lttb_indices(dates: np.ndarray, values: np.ndarray, n_points: int) -> np.ndarray:
+    """Return the indices of the points kept by the Largest-Triangle-Three-Buckets algorithm."""
+    valid_indices: np.ndarray = np.flatnonzero(~np.isnan(values))
+    if len(valid_indices) <= n_points:
+        return valid_indices
+
+    x: np.ndarray = dates[valid_indices].astype("int64").astype(np.float64)
+    y: np.ndarray = values[valid_indices].astype(np.float64)
+    # The first and the last points are always kept, the others are split in buckets.
+    edges: np.ndarray = np.linspace(1, len(x) - 1, n_points - 1).astype(int)
+    selected: list[int] = [0]
+    for bucket in range(n_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_x, next_y = x[end : edges[bucket + 2]].mean(), y[end : edges[bucket + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        # Keep the point forming the largest triangle with the last kept point and the next bucket average.
+        last: int = selected[-1]
+        areas: np.ndarray = np.abs(
+            (x[last] - next_x) * (y[start:end] - y[last]) - (x[last] - x[start:end]) * (next_y - y[last])
+        )
+        selected.append(start + int(areas.argmax()))
+    selected.append(len(x) - 1)
+
+    return valid_indices[selected]
+
+
+class _TypedColumn:
+    """A growable typed array used to collect a column of weather data."""
+
+    def __init__(self, dtype: Union[str, type], capacity: int = COLUMN_CAPACITY) -> None:
+        """Initialize the column storage."""
+        self._data: np.ndarray = np.empty(capacity, dtype=dtype)
+        self.size: int = 0
+
+    def extend(self, values: np.ndarray) -> None:
+        """Append a block of values, doubling the storage until they fit."""
+        new_size: int = self.size + len(values)
+        if new_size > len(self._data):
+            capacity: int = len(self._data)
+            while capacity < new_size:
+                capacity *= 2
+            self._data = np.resize(self._data, capacity)
+        self._data[self.size : new_size] = values
+        self.size = new_size
+
+    def to_array(self) -> np.ndarray:
+        """Return the collected values as a trimmed array."""
+        return self._data[: self.size].copy()
+
+
+class WeatherDataPlotter:  # pylint: disable=R0902
     """Plot and visualize weather data."""
 
-    def __init__(self, title: str = "", title_color: str = "k") -> None:
-        """Initialize the weather plot attributes."""
+    def __init__(
+        self, title: str = "", title_color: str = "k", cache: Optional[WeatherCache] = None, headless: bool = False
+    ) -> None:
+        """
+        Initialize the weather plot attributes. If headless is True, the figures aren't
+        managed by pyplot: they can only be saved, and the matplotlib backend is left untouched.
+        """
         self.title = title
         self.title_color = title_color
+        self.cache = cache
+        self.headless = headless
         self.dataset: WeatherDataset = {}  # type: ignore
         self.datasets: list[WeatherDataset] = []
+        self.load_errors: dict[Path, str] = {}
+        self.overlays: list[Overlay] = []
+        # The date index shared by the datasets once they are aligned.
+        self.date_index: np.ndarray = np.empty(0, dtype="datetime64[D]")
+        self._columns: dict[str, _TypedColumn] = {}
+
+        # The figure and axes are made on first use, see the fig and ax properties.
+        self._fig: Optional["Figure"] = None
+        self._ax: Optional["Axes"] = None
+        # The figure of the small multiples made by plot_grid.
+        self.grid_fig: Optional["Figure"] = None
+
+    @property
+    def fig(self) -> "Figure":
+        """The figure of the plot, made on first use."""
+        if self._fig is None:
+            self._make_figure()
+        return self._fig  # type: ignore
+
+    @property
+    def ax(self) -> "Axes":
+        """The axes of the plot, made on first use."""
+        if self._ax is None:
+            self._make_figure()
+        return self._ax  # type: ignore
+
+    def _make_figure(self) -> None:
+        """Make the figure and axes of the plot."""
+        self._fig = self._new_figure((14, 5.5), 130)
+        self._ax = self._fig.subplots()
+
+    def _new_figure(self, figsize: tuple[float, float], dpi: int) -> "Figure":
+        """Set the style and make a figure, managed by pyplot unless the plotter is headless."""
+        import matplotlib.pyplot as plt  # pylint: disable=C0415
+        import matplotlib.figure as mfigure  # pylint: disable=C0415
 
         plt.style.use("seaborn-v0_8")
-        self.fig: Figure
-        self.ax: plt.Axes
-        self.fig, self.ax = plt.subplots(figsize=(14, 5.5), dpi=130)
+        if self.headless:
+            return mfigure.Figure(figsize=figsize, dpi=dpi)
+        return plt.figure(figsize=figsize, dpi=dpi)
 
     def weather_dataset(  # pylint: disable=R0913
         self,
@@ -79,10 +334,121 @@ class WeatherDataPlotter:
         label: str = "",
         temp_scale: Literal["C°", "F°"] = "C°",
         precip_scale: Literal["cm", "in"] = "cm",
+        float32: bool = False,
+        chunk_size: int = CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        date_format: str = DATE_FORMAT,
+        columns: tuple[str, ...] = (),
+        start_date: str = "",
+        end_date: str = "",
+        stations: tuple[str, ...] = (),
+        sorted_dates: bool = False,
     ) -> None:
+        """
+        Make a dictionary to store the data needed for the visualization.
+
+        All the requested data (highs, lows, precipitations and any extra NOAA columns,
+        such as "SNOW" or "TAVG") are extracted in a single pass over the file.
+
+        The file is read in chunks of chunk_size rows, so peak memory doesn't depend
+        on the file size. If given, progress is called after each chunk with the rows read,
+        the bytes read and the file size. ISO dates are parsed a chunk at a time,
+        any other date_format falls back to strptime. If the plotter has a cache,
+        the parsed data is loaded from it when the file didn't change.
+
+        Only the rows from start_date to end_date (ISO dates, both included) and of the
+        given station names are kept. They are checked on the raw DATE and NAME strings,
+        so the other rows are never converted. If sorted_dates is True, the file is
+        known to be sorted by date and reading stops once end_date is passed.
+        """
+        self.dataset = self._make_dataset(
+            path,
+            high,
+            low,
+            precip,
+            color,
+            alpha,
+            label,
+            temp_scale,
+            precip_scale,
+            float32,
+            date_format,
+            columns,
+            start_date,
+            end_date,
+            stations,
+            sorted_dates,
+        )
+
+        try:
+            self._load_data(chunk_size, progress)
+        except (FileNotFoundError, ValueError) as err:
+            logging.error("%s", err)
+            sys.exit()
+        # Store the data in the datasets dictionary. Used to generate the visualization.
+        self.datasets.append(self.dataset)
+
+    def weather_datasets(self, specs: list[StationSpec], workers: Optional[int] = None) -> list[WeatherDataset]:
+        """
+        Load many stations at once, parsing them concurrently in a pool of worker processes.
+
+        Each spec holds the arguments of weather_dataset. The loaded datasets are stored
+        in the same order as the specs and returned. A file that can't be loaded
+        doesn't stop the others: its error is logged and stored in load_errors.
+        """
+        if workers is None:
+            workers = min(len(specs), os.cpu_count() or 1)
+
+        if workers <= 1:
+            results: list[tuple[Optional[WeatherDataset], str]] = [self._load_station(spec) for spec in specs]
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_station_loader, initargs=(self.cache,)) as executor:
+                results = list(executor.map(_load_station, specs))
+
+        loaded_datasets: list[WeatherDataset] = []
+        for spec, (dataset, error) in zip(specs, results):
+            if dataset is None:
+                logging.error("Could not load %s: %s", spec["path"], error)
+                self.load_errors[spec["path"]] = error
+            else:
+                loaded_datasets.append(dataset)
+
+        self.datasets.extend(loaded_datasets)
+        return loaded_datasets
+
+    def _load_station(self, spec: StationSpec) -> tuple[Optional[WeatherDataset], str]:
+        """Load the dataset of a station spec. Return the error message if it can't be loaded."""
+        try:
+            self.dataset = self._make_dataset(**spec)
+            self._load_data(CHUNK_SIZE, None)
+        # Any failure of a file (missing, misshapen, unreadable...) is reported without stopping the others.
+        except Exception as err:  # pylint: disable=W0718
+            return None, f"{type(err).__name__}: {err}"
+        return self.dataset, ""
+
+    def _make_dataset(  # pylint: disable=R0913
+        self,
+        path: Path,
+        high: bool = False,
+        low: bool = False,
+        precip: bool = False,
+        color: str = "",
+        alpha: float = 1.0,
+        label: str = "",
+        temp_scale: Literal["C°", "F°"] = "C°",
+        precip_scale: Literal["cm", "in"] = "cm",
+        float32: bool = False,
+        date_format: str = DATE_FORMAT,
+        columns: tuple[str, ...] = (),
+        start_date: str = "",
+        end_date: str = "",
+        stations: tuple[str, ...] = (),
+        sorted_dates: bool = False,
+    ) -> WeatherDataset:
         """Make a dictionary to store the data needed for the visualization."""
-        self.dataset = {
+        return {
             "path": path,
+            "date_format": date_format,
             "high": high,
             "low": low,
             "precip": precip,
@@ -91,180 +457,724 @@ class WeatherDataPlotter:
             "label": label,
             "temp_scale": temp_scale,
             "precip_scale": precip_scale,
-            "dates": [],
+            "float32": float32,
+            "columns": tuple(columns),
+            "start_date": start_date,
+            "end_date": end_date,
+            "stations": tuple(stations),
+            "sorted_dates": sorted_dates,
+            "dates": np.empty(0, dtype="datetime64[D]"),
             "loc_name": "",
-            "weather_info": {"highs": [], "lows": [], "precipitations": []},
+            "weather_info": {},
+            "missing": {},
+            "missing_report": {},
+            "highlights": [],
             "date_index": 0,
             "name_index": 0,
             "high_index": 0,
             "low_index": 0,
             "precip_index": 0,
+            "column_indices": {},
         }
 
-        self._read_file()
-        # Store the data in the datasets dictionary. Used to generate the visualization.
+    def share_dataset(  # pylint: disable=R0913
+        self,
+        dataset: WeatherDataset,
+        high: bool = False,
+        low: bool = False,
+        precip: bool = False,
+        color: str = "",
+        alpha: float = 1.0,
+        label: str = "",
+    ) -> None:
+        """
+        Add a dataset already loaded, possibly by another plotter, with new plot options.
+        The data is shared, so one ingestion can feed several plots.
+        Raise ValueError if the dataset wasn't loaded with the requested weather types.
+        """
+        # The weather types not requested when loading the dataset have no values.
+        requested: tuple[bool, ...] = (high, low, precip)
+        weather_info: dict[str, np.ndarray] = dataset["weather_info"]
+        missing: list[str] = [
+            weather_type
+            for weather_type, wanted in zip(WEATHER_TYPES, requested)
+            if wanted and len(weather_info.get(weather_type, ())) != len(dataset["dates"])
+        ]
+        if missing:
+            raise ValueError(f"{dataset['path']} wasn't loaded with {', '.join(missing)}, load them to share them.")
+        self.dataset = {
+            **dataset,
+            "high": high,
+            "low": low,
+            "precip": precip,
+            "color": color,
+            "alpha": alpha,
+            "label": label,
+            "highlights": [],
+        }
         self.datasets.append(self.dataset)
 
-    def _read_file(self) -> None:
-        """Read the weather file."""
+    def align_datasets(self, how: Join = "outer") -> np.ndarray:
+        """
+        Align the loaded datasets to a single shared date index and return it.
+
+        The index holds the dates of any dataset ("outer") or of all of them ("inner").
+        Every dataset then refers to the same index array, and its values are reindexed
+        to it, with NaN for the dates it has no data for. So the stations can be
+        compared with plain array operations, see station_matrix.
+        """
+        dates_list: list[np.ndarray] = [dataset["dates"] for dataset in self.datasets]
+        join: Callable[[np.ndarray, np.ndarray], np.ndarray] = np.union1d if how == "outer" else np.intersect1d
+        date_index: np.ndarray = np.unique(dates_list[0]) if dates_list else np.empty(0, dtype="datetime64[D]")
+        date_index = reduce(join, dates_list[1:], date_index)
+        # The index is shared between the datasets, so it must not be modified.
+        date_index.flags.writeable = False
+
+        for dataset in self.datasets:
+            self._align_dataset(dataset, date_index)
+        self.date_index = date_index
+        return date_index
+
+    @staticmethod
+    def _align_dataset(dataset: WeatherDataset, date_index: np.ndarray) -> None:
+        """Reindex the values of the dataset to the date index, filling the other dates with NaN."""
+        dates: np.ndarray = dataset["dates"]
+        in_index: np.ndarray = np.isin(dates, date_index)
+        positions: np.ndarray = np.searchsorted(date_index, dates[in_index])
+
+        weather_info: dict[str, np.ndarray] = {}
+        missing: dict[str, np.ndarray] = {}
+        for weather_type, values in dataset["weather_info"].items():
+            # The columns that weren't requested are empty and stay so.
+            if len(values) == len(dates):
+                aligned_values: np.ndarray = np.full(len(date_index), np.nan, dtype=values.dtype)
+                aligned_values[positions] = values[in_index]
+                values = aligned_values
+            weather_info[weather_type] = values
+            missing[weather_type] = np.isnan(values)
+
+        dataset["dates"] = date_index
+        dataset["weather_info"] = weather_info
+        dataset["missing"] = missing
+
+    def station_matrix(self, weather_type: str = "highs") -> np.ndarray:
+        """
+        Return the values of a weather type of the aligned datasets as a matrix, with
+        a row per dataset and a column per date of the index. Differences and spreads
+        between stations are then vectorized, e.g. matrix[0] - matrix[1].
+        """
+        if any(dataset["dates"] is not self.date_index for dataset in self.datasets):
+            raise ValueError("The datasets are not aligned, call align_datasets first.")
+        return np.vstack([dataset["weather_info"][weather_type] for dataset in self.datasets])
+
+    def _load_data(self, chunk_size: int, progress: Optional[ProgressCallback]) -> None:
+        """Fill the dataset from the cache or, if the data is not cached, from the file."""
+        if not self._load_cached_data():
+            if self.dataset["path"].suffix == ".dly":
+                self._read_dly_file()
+            else:
+                self._read_file(chunk_size, progress)
+            self._cache_data()
+        self._report_missing_data()
+
+    def _load_cached_data(self) -> bool:
+        """Fill the dataset from the cache. Return False if the data is not cached."""
+        if self.cache is None:
+            return False
         try:
-            lines: list[str] = self.dataset["path"].read_text().splitlines()
-        except FileNotFoundError as fne:
-            logging.error("%s", fne)
-            sys.exit()
-        else:
-            reader: Iterator[list[str]] = csv.reader(lines)
+            cached: Optional[dict[str, np.ndarray]] = self.cache.load(self._cache_key())
+        except FileNotFoundError:
+            return False
+        if cached is None:
+            return False
+
+        self.dataset["dates"] = cached["dates"]
+        self.dataset["loc_name"] = str(cached["loc_name"])
+        for weather_type in self._weather_types():
+            self.dataset["weather_info"][weather_type] = cached[weather_type]
+            self.dataset["missing"][weather_type] = np.isnan(cached[weather_type])
+        for index_name, index in zip(INDEX_NAMES, cached["indices"]):
+            self.dataset[index_name] = int(index)  # type: ignore
+        for column, index in zip(self.dataset["columns"], cached["column_indices"]):
+            self.dataset["column_indices"][column] = int(index)
+        logging.debug("Loaded %s from the cache", self.dataset["path"])
+        return True
+
+    def _cache_data(self) -> None:
+        """Store the parsed data of the dataset in the cache."""
+        if self.cache is None:
+            return
+        arrays: dict[str, np.ndarray] = {
+            "dates": self.dataset["dates"],
+            "loc_name": np.array(self.dataset["loc_name"]),
+            "indices": np.array([self.dataset[index_name] for index_name in INDEX_NAMES]),  # type: ignore
+            "column_indices": np.array(list(self.dataset["column_indices"].values()), dtype=np.int64),
+            **self.dataset["weather_info"],
+        }
+        self.cache.store(self._cache_key(), arrays)
+
+    def _cache_key(self) -> str:
+        """Return the cache key of the dataset, based on the file and the requested columns."""
+        # The predicates are part of the key, since the cached data only has the matching rows.
+        #   So are the scales, since the values of the .dly files are converted to them.
+        columns: dict[str, Union[bool, str, list[str]]] = {
+            "high": self.dataset["high"],
+            "low": self.dataset["low"],
+            "precip": self.dataset["precip"],
+            "float32": self.dataset["float32"],
+            "date_format": self.dataset["date_format"],
+            "columns": list(self.dataset["columns"]),
+            "start_date": self.dataset["start_date"],
+            "end_date": self.dataset["end_date"],
+            "stations": list(self.dataset["stations"]),
+            "temp_scale": self.dataset["temp_scale"],
+            "precip_scale": self.dataset["precip_scale"],
+        }
+        return self.cache.cache_key(self.dataset["path"], columns)  # type: ignore
+
+    def _read_file(self, chunk_size: int, progress: Optional[ProgressCallback]) -> None:
+        """Read the weather file, streaming it in chunks of rows."""
+        path: Path = self.dataset["path"]
+        # The progress is the bytes read from the binary file under the text one.
+        with (
+            path.open("rb") as binary_file,
+            io.TextIOWrapper(binary_file, encoding="utf-8", newline="") as weather_file,
+        ):
+            file_size: int = os.fstat(binary_file.fileno()).st_size
+            reader: Iterator[list[str]] = csv.reader(weather_file)
             header_row: list[str] = next(reader)
 
             self._get_data_indices(header_row)
-            self._extract_data(reader)
+            self._init_columns()
+            for chunk in self._read_chunks(reader, chunk_size):
+                rows, past_end_date = self._filter_rows(chunk)
+                if rows:
+                    self._extract_data(rows)
+                if progress is not None:
+                    progress(self._columns["dates"].size, binary_file.tell(), file_size)
+                if past_end_date:
+                    break
+            self._store_columns()
+
+    def _read_dly_file(self) -> None:
+        """Read a GHCN-Daily .dly file, converting its values to the scales of the dataset."""
+        path: Path = self.dataset["path"]
+        requested: tuple[bool, ...] = (self.dataset["high"], self.dataset["low"], self.dataset["precip"])
+        weather_types: list[str] = [weather_type for weather_type, wanted in zip(WEATHER_TYPES, requested) if wanted]
+        weather_types.extend(self.dataset["columns"])
+        elements: tuple[str, ...] = tuple(DLY_ELEMENTS.get(name, name) for name in weather_types)
+        station_id, dates, values = read_dly(path, elements)
+        self.dataset["loc_name"] = station_name(path, station_id)
+
+        kept: np.ndarray = self._dly_kept_dates(dates, station_id)
+        self._init_columns()
+        self._columns["dates"].extend(dates[kept])
+        for weather_type, element in zip(weather_types, elements):
+            self._columns[weather_type].extend(self._convert_dly_values(weather_type, values[element][kept]))
+        self._store_columns()
+
+    def _dly_kept_dates(self, dates: np.ndarray, station_id: str) -> np.ndarray:
+        """Return the mask of the dates of a .dly file in the date range, if it's one of the stations."""
+        kept: np.ndarray = np.ones(len(dates), dtype=bool)
+        if self.dataset["start_date"]:
+            kept &= dates >= np.datetime64(self.dataset["start_date"])
+        if self.dataset["end_date"]:
+            kept &= dates <= np.datetime64(self.dataset["end_date"])
+        stations: tuple[str, ...] = self.dataset["stations"]
+        if stations and station_id not in stations and self.dataset["loc_name"] not in stations:
+            kept[:] = False
+        return kept
+
+    def _convert_dly_values(self, weather_type: str, values: np.ndarray) -> np.ndarray:
+        """Convert the tenths of °C or mm of a .dly file to the scales of the dataset."""
+        if weather_type in ("highs", "lows"):
+            celsius: np.ndarray = values / 10
+            return celsius * 9 / 5 + 32 if self.dataset["temp_scale"] == "F°" else celsius
+        if weather_type == "precipitations":
+            return values / 254 if self.dataset["precip_scale"] == "in" else values / 100
+        # The extra columns are kept in the units of the file.
+        return values
+
+    @staticmethod
+    def _read_chunks(reader: Iterator[list[str]], chunk_size: int) -> Iterator[list[list[str]]]:
+        """Yield the rows of the file in chunks of at most chunk_size rows."""
+        while chunk := list(islice(reader, chunk_size)):
+            yield chunk
+
+    def _filter_rows(self, chunk: list[list[str]]) -> tuple[list[list[str]], bool]:
+        """
+        Keep the rows of the chunk in the date range and of the stations of interest.
+        Also return True if the file is sorted by date and the next rows are past the end date.
+        """
+        start_date: str = self.dataset["start_date"]
+        end_date: str = self.dataset["end_date"]
+        stations: frozenset[str] = frozenset(self.dataset["stations"])
+        if not (start_date or end_date or stations):
+            return chunk, False
+
+        name_index: int = self.dataset["name_index"]
+        date_keys: list[str] = self._extract_date_keys(chunk)
+        rows: list[list[str]] = [
+            row
+            for row, date_key in zip(chunk, date_keys)
+            if (not start_date or date_key >= start_date)
+            and (not end_date or date_key <= end_date)
+            and (not stations or row[name_index] in stations)
+        ]
+        past_end_date: bool = self.dataset["sorted_dates"] and bool(end_date) and date_keys[-1] > end_date
+        return rows, past_end_date
+
+    def _extract_date_keys(self, chunk: list[list[str]]) -> list[str]:
+        """Return the dates of a chunk of rows as ISO strings, which compare in date order."""
+        date_index: int = self.dataset["date_index"]
+        if self.dataset["date_format"] == DATE_FORMAT:
+            return [row[date_index] for row in chunk]
+        return [_parse_date(row[date_index], self.dataset["date_format"]).strftime(DATE_FORMAT) for row in chunk]
 
     def _get_data_indices(self, header_row: list[str]) -> None:
-        """Get the indices of the weather data."""
-        try:
-            self.dataset["date_index"] = header_row.index("DATE")
-            self.dataset["name_index"] = header_row.index("NAME")
-
-            if self.dataset["high"]:
-                self.dataset["high_index"] = header_row.index("TMAX")
-            if self.dataset["low"]:
-                self.dataset["low_index"] = header_row.index("TMIN")
-            if self.dataset["precip"]:
-                self.dataset["precip_index"] = header_row.index("PRCP")
-        except ValueError as ve:
-            logging.error("%s", ve)
-            sys.exit()
+        """Get the indices of the weather data. Raise ValueError if a column is missing."""
+        self.dataset["date_index"] = header_row.index("DATE")
+        self.dataset["name_index"] = header_row.index("NAME")
 
-    def _extract_data(self, reader: Iterator[list[str]]) -> None:
-        """Determine which data is needed for the plot and extract them."""
-        for row in reader:
-            self._extract_station_name(row)
-            date = self._extract_date(row)
-            self._extract_weather_data(row, date)
+        if self.dataset["high"]:
+            self.dataset["high_index"] = header_row.index("TMAX")
+        if self.dataset["low"]:
+            self.dataset["low_index"] = header_row.index("TMIN")
+        if self.dataset["precip"]:
+            self.dataset["precip_index"] = header_row.index("PRCP")
+        for column in self.dataset["columns"]:
+            self.dataset["column_indices"][column] = header_row.index(column)
+
+    def _weather_types(self) -> tuple[str, ...]:
+        """Return the names of the weather data columns of the dataset, extra columns included."""
+        return WEATHER_TYPES + self.dataset["columns"]
+
+    def _init_columns(self) -> None:
+        """Initialize the typed columns that collect the dates and the weather data."""
+        value_dtype: type = np.float32 if self.dataset["float32"] else np.float64
+        self._columns = {"dates": _TypedColumn("datetime64[D]")}
+        for weather_type in self._weather_types():
+            self._columns[weather_type] = _TypedColumn(value_dtype)
+
+    def _store_columns(self) -> None:
+        """Store the collected columns and their missing values mask in the dataset."""
+        self.dataset["dates"] = self._columns.pop("dates").to_array()
+        for weather_type, column in self._columns.items():
+            values: np.ndarray = column.to_array()
+            self.dataset["weather_info"][weather_type] = values
+            self.dataset["missing"][weather_type] = np.isnan(values)
+        self._columns = {}
+
+    def _extract_data(self, chunk: list[list[str]]) -> None:
+        """Extract the data needed for the plot from a chunk of rows."""
+        self._extract_station_name(chunk[0])
+        dates: np.ndarray = self._extract_dates(chunk)
+        self._columns["dates"].extend(dates)
+
+        for weather_type, weather_index in self._weather_data_indices():
+            values: np.ndarray = self._collect_values(chunk, weather_index)
+            self._columns[weather_type].extend(values)
 
     def _extract_station_name(self, row: list[str]) -> None:
         """Extract the name of the weather station from the row."""
         if not self.dataset["loc_name"]:
             self.dataset["loc_name"] = row[self.dataset["name_index"]]
 
+    def _extract_dates(self, chunk: list[list[str]]) -> np.ndarray:
+        """Extract the dates of the recordings from a chunk of rows."""
+        if self.dataset["date_format"] == DATE_FORMAT:
+            date_index: int = self.dataset["date_index"]
+            return _parse_iso_dates(tuple(row[date_index] for row in chunk))
+
+        dates: list[datetime] = [self._extract_date(row) for row in chunk]
+        return np.array(dates, dtype="datetime64[D]")
+
     def _extract_date(self, row: list[str]) -> datetime:
         """Extract the dates of the recording from the row."""
-        date: datetime = datetime.strptime(row[self.dataset["date_index"]], DATE_FORMAT)
+        date: datetime = _parse_date(row[self.dataset["date_index"]], self.dataset["date_format"])
         return date
 
-    def _extract_weather_data(self, row: list[str], date: datetime) -> None:
-        """Determine the weather data of interest and extract them."""
-        if self.dataset["high"] and self.dataset["low"]:
-            self._collect_data(row, "highs", "lows", 0, date)
-        elif self.dataset["high"] and not self.dataset["low"]:
-            self._collect_data(row, "highs", "", self.dataset["high_index"], date)
-        elif self.dataset["low"] and not self.dataset["high"]:
-            self._collect_data(row, "lows", "", self.dataset["low_index"], date)
-        elif self.dataset["precip"]:
-            self._collect_data(row, "precipitations", "", self.dataset["precip_index"], date)
+    def _weather_data_indices(self) -> list[tuple[str, int]]:
+        """Determine all the weather data of interest and return their columns indices."""
+        weather_indices: list[tuple[str, int]] = []
+        if self.dataset["high"]:
+            weather_indices.append(("highs", self.dataset["high_index"]))
+        if self.dataset["low"]:
+            weather_indices.append(("lows", self.dataset["low_index"]))
+        if self.dataset["precip"]:
+            weather_indices.append(("precipitations", self.dataset["precip_index"]))
+        weather_indices.extend(self.dataset["column_indices"].items())
+        return weather_indices
+
+    def _collect_values(self, chunk: list[list[str]], weather_index: int) -> np.ndarray:
+        """Convert a column of the chunk to floats in one step, using NaN for missing values."""
+        raw_values: np.ndarray = np.array([row[weather_index] for row in chunk])
+        value_dtype: type = np.float32 if self.dataset["float32"] else np.float64
+        try:
+            return np.where(raw_values == "", "nan", raw_values).astype(value_dtype)
+        except ValueError:
+            # Fall back to a value by value conversion if the column has malformed values.
+            return np.array([self._parse_value(value) for value in raw_values], dtype=value_dtype)
 
-    def _collect_data(  # pylint: disable=R0913
+    @staticmethod
+    def _parse_value(value: str) -> float:
+        """Convert a raw weather value to a float. Missing values become NaN."""
+        try:
+            return float(value)
+        except ValueError:
+            return math.nan
+
+    def _report_missing_data(self) -> None:
+        """Count the missing values of each column and log them once for the whole dataset."""
+        self.dataset["missing_report"] = {}
+        for weather_type, missing in self.dataset["missing"].items():
+            if not missing.any():
+                continue
+            # The starts and ends of the runs of consecutive missing values.
+            edges: np.ndarray = np.diff(np.concatenate([[0], missing.astype(np.int8), [0]]))
+            starts: np.ndarray = self.dataset["dates"][np.flatnonzero(edges == 1)]
+            ends: np.ndarray = self.dataset["dates"][np.flatnonzero(edges == -1) - 1]
+            self.dataset["missing_report"][weather_type] = {
+                "count": int(missing.sum()),
+                "date_ranges": list(zip(starts, ends)),
+            }
+
+        if self.dataset["missing_report"]:
+            summary: str = "; ".join(
+                f"{weather_type}: {report["count"]} missing ({self._format_ranges(report["date_ranges"])})"
+                for weather_type, report in self.dataset["missing_report"].items()
+            )
+            logging.warning("Missing data in %s, stored as NaN. %s", self.dataset["path"], summary)
+
+    @staticmethod
+    def _format_ranges(date_ranges: list[tuple[np.datetime64, np.datetime64]]) -> str:
+        """Return a short text of the missing date ranges."""
+        texts: list[str] = [f"{start}" if start == end else f"{start} to {end}" for start, end in date_ranges[:3]]
+        if len(date_ranges) > 3:
+            texts.append(f"and {len(date_ranges) - 3} more ranges")
+        return ", ".join(texts)
+
+    def plot_visual(  # pylint: disable=R0913
         self,
-        row: list[str],
-        weather_type_1: str,
-        weather_type_2: str,
-        weather_type_index: int,
-        date: datetime,
+        shade_between: bool = True,
+        y_limit: Optional[tuple[Union[float, int], Union[float, int]]] = None,
+        save_path: Optional[Path] = None,
+        downsample: Optional[Downsampling] = None,
+        gaps: Gaps = "break",
     ) -> None:
-        """Collect the specified data in the _extract methods and store them."""
-        try:
-            values: list[float] = self._collect_values(row, weather_type_1, weather_type_2, weather_type_index)
-        except ValueError as ve:
-            logging.error("Missing data for %s: %s", date, ve)
+        """
+        Generate and visualize the plot using the data previously extracted.
+        If save_path is given, the plot is saved to it (PNG, SVG or PDF) instead of shown.
+        If downsample is given ("minmax" or "lttb"), long series are reduced to about
+        the pixel width of the axes before plotting, keeping their extremes.
+        Missing values break the lines, unless gaps is "interpolate" or "drop".
+        """
+        for self.dataset in self.datasets:
+            self._make_plot(shade_between, downsample, gaps)
+        self._plot_overlays()
+
+        self._customize_plot(y_limit)
+        if save_path is not None:
+            self.fig.savefig(save_path)
         else:
-            self._store_collected_values(weather_type_1, weather_type_2, date, values)
+            import matplotlib.pyplot as plt  # pylint: disable=C0415
 
-    def _collect_values(
+            plt.show()
+
+    def plot_grid(  # pylint: disable=R0913
         self,
-        row: list[str],
-        weather_type_1: str,
-        weather_type_2: str,
-        weather_type_index: int,
-    ) -> list[float]:
-        """Collect the specified weather data values from the row."""
-        values: list[float] = []
-
-        if weather_type_1 == "highs" and weather_type_2 == "lows":
-            for weather_index in ("high_index", "low_index"):
-                values.append(float(row[self.dataset[weather_index]]))  # type: ignore
-        elif weather_type_1 in ("highs", "lows", "precipitations"):
-            values.append(float(row[weather_type_index]))
+        n_cols: Optional[int] = None,
+        shade_between: bool = True,
+        y_limit: Optional[tuple[Union[float, int], Union[float, int]]] = None,
+        save_path: Optional[Path] = None,
+        downsample: Optional[Downsampling] = None,
+        gaps: Gaps = "break",
+    ) -> None:
+        """
+        Plot the datasets as small multiples, one panel per station, in a grid of n_cols
+        columns with shared axes. The lines and the shaded area of a panel are drawn as
+        one collection each, so even sheets of many stations render in a single pass.
+        """
+        n_panels: int = len(self.datasets)
+        n_cols = n_cols or math.ceil(math.sqrt(n_panels))
+        n_rows: int = math.ceil(n_panels / n_cols)
+        panel_width, panel_height = GRID_PANEL_SIZE
+        self.grid_fig = self._new_figure((n_cols * panel_width, n_rows * panel_height), 100)
+        axes: np.ndarray = self.grid_fig.subplots(n_rows, n_cols, sharex=True, sharey=True, squeeze=False)
 
-        return values
+        # The data limits of all the panels, so the shared axes are scaled only once.
+        data_limits: list[np.ndarray] = [
+            self._make_panel(panel_ax, shade_between, downsample, gaps)
+            for panel_ax, self.dataset in zip(axes.flat, self.datasets)
+        ]
+        for panel_ax in axes.flat[n_panels:]:
+            panel_ax.set_visible(False)
+
+        self._customize_grid(axes, np.vstack(data_limits), y_limit)
+        if save_path is not None:
+            self.grid_fig.savefig(save_path)
+        else:
+            import matplotlib.pyplot as plt  # pylint: disable=C0415
 
-    def _store_collected_values(
+            plt.show()
+
+    def _make_panel(
+        self,
+        panel_ax: "Axes",
+        shade_between: bool,
+        downsample: Optional[Downsampling],
+        gaps: Gaps,
+    ) -> np.ndarray:
+        """
+        Make the panel of the dataset, adding its lines and shaded area as collections.
+        Return the data limits of the panel as [x_min, x_max, y_min, y_max].
+        """
+        import matplotlib.dates as mdates  # pylint: disable=C0415
+        import matplotlib.collections as mcollections  # pylint: disable=C0415
+
+        weather_info_dict, weather_types, colors, alpha = self._select_weather_data()
+        dates, weather_info_dict = self._handle_gaps(weather_types, weather_info_dict, gaps)
+        dates, weather_info_dict = self._downsample(dates, weather_types, weather_info_dict, downsample, panel_ax)
+        days: np.ndarray = mdates.date2num(dates)
+
+        lines: list[np.ndarray] = [
+            np.column_stack([days, weather_info_dict[weather_type]]) for weather_type in weather_types
+        ]
+        panel_ax.add_collection(
+            mcollections.LineCollection(lines, colors=colors, alpha=alpha, linewidths=1), autolim=False
+        )
+        if shade_between:
+            y2: Union[np.ndarray, float] = weather_info_dict[weather_types[1]] if len(weather_types) == 2 else 0.0
+            facecolor: str = "blue" if len(weather_types) == 2 else colors[0]
+            polygons: list[np.ndarray] = self._fill_polygons(days, weather_info_dict[weather_types[0]], y2)
+            panel_ax.add_collection(
+                mcollections.PolyCollection(polygons, facecolors=facecolor, alpha=0.3, edgecolors="none"), autolim=False
+            )
+
+        panel_ax.set_title(self._format_plot_title([self.dataset]), fontsize=FONT_SIZE_LABELS)
+        values: np.ndarray = np.concatenate([line[:, 1] for line in lines])
+        if shade_between and len(weather_types) == 1:
+            values = np.append(values, 0.0)
+        with np.errstate(invalid="ignore"):
+            return np.array([np.nanmin(days), np.nanmax(days), np.nanmin(values), np.nanmax(values)])
+
+    @staticmethod
+    def _fill_polygons(days: np.ndarray, y1: np.ndarray, y2: Union[np.ndarray, float]) -> list[np.ndarray]:
+        """Return the polygons of the area between y1 and y2, split where a value is missing."""
+        y2 = np.broadcast_to(y2, y1.shape)
+        valid: np.ndarray = ~(np.isnan(y1) | np.isnan(y2))
+        edges: np.ndarray = np.diff(np.concatenate([[0], valid.astype(np.int8), [0]]))
+        polygons: list[np.ndarray] = []
+        for start, end in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+            upper: np.ndarray = np.column_stack([days[start:end], y1[start:end]])
+            lower: np.ndarray = np.column_stack([days[start:end], y2[start:end]])
+            polygons.append(np.concatenate([upper, lower[::-1]]))
+        return polygons
+
+    def _customize_grid(
         self,
-        weather_type_1: str,
-        weather_type_2: str,
-        date: datetime,
-        values: list[float],
+        axes: np.ndarray,
+        data_limits: np.ndarray,
+        y_limit: Optional[tuple[Union[float, int], Union[float, int]]],
     ) -> None:
-        """Store the collected weather data values in the dataset dictionary."""
-        self.dataset["dates"].append(date)
-        if weather_type_1 == "highs" and weather_type_2 == "lows":
-            for weather_type, value in [
-                (weather_type_1, values[0]),
-                (weather_type_2, values[1]),
-            ]:
-                self._append_data(weather_type, value)
-        elif (weather_type_1 in ("highs", "lows", "precipitations")) and not weather_type_2:
-            self._append_data(weather_type_1, values[0])
-
-    def _append_data(self, weather_type: str, value: float) -> None:
-        """Append the weather data value to the specific list in the dataset."""
-        self.dataset["weather_info"][weather_type].append(value)
-
-    def plot_visual(
+        """Customize the grid. The axes are shared, so their limits, locator and formatter are set once."""
+        import matplotlib.dates as mdates  # pylint: disable=C0415
+
+        grid_fig: "Figure" = self.grid_fig  # type: ignore
+        first_ax: "Axes" = axes.flat[0]
+        first_ax.xaxis_date()
+        locator: "AutoDateLocator" = mdates.AutoDateLocator(maxticks=4)
+        first_ax.xaxis.set_major_locator(locator)
+        first_ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+        with np.errstate(invalid="ignore"):
+            x_min, y_min = np.nanmin(data_limits[:, [0, 2]], axis=0)
+            x_max, y_max = np.nanmax(data_limits[:, [1, 3]], axis=0)
+        y_margin: float = 0.05 * (y_max - y_min)
+        first_ax.set_xlim(x_min, x_max)
+        first_ax.set_ylim(*(y_limit or (y_min - y_margin, y_max + y_margin)))
+
+        for panel_ax in axes.flat:
+            panel_ax.grid(True, linestyle="--")
+            panel_ax.tick_params(labelsize=FONT_SIZE_TICKS)
+            panel_ax.label_outer()
+        grid_fig.suptitle(self.title, color=self.title_color, fontsize=FONT_SIZE_TITLE)
+        if self.dataset["high"] or self.dataset["low"]:
+            grid_fig.supylabel(f"Temperature ({self.dataset["temp_scale"]})", fontsize=FONT_SIZE_LABELS)
+        elif self.dataset["precip"]:
+            grid_fig.supylabel(f"Precipitation Amount ({self.dataset["precip_scale"]})", fontsize=FONT_SIZE_LABELS)
+        grid_fig.subplots_adjust(hspace=0.45, wspace=0.08)
+
+    def clear_plot(self, title: str = "", title_color: str = "k") -> None:
+        """Clear the datasets and the axes, so the same figure can be reused for a new plot."""
+        self.title = title
+        self.title_color = title_color
+        self.datasets = []
+        self.date_index = np.empty(0, dtype="datetime64[D]")
+        self.load_errors = {}
+        self.overlays = []
+        if self._ax is not None:
+            self._ax.clear()
+
+    def add_overlay(  # pylint: disable=R0913
         self,
-        shade_between: bool = True,
-        y_limit: Optional[tuple[Union[float, int], Union[float, int]]] = None,
+        dates: np.ndarray,
+        values: np.ndarray,
+        label: str,
+        color: str = "k",
+        linestyle: str = "--",
     ) -> None:
-        """Generate and visualize the plot using the data previously extracted."""
-        for self.dataset in self.datasets:
-            self._make_plot(shade_between)
+        """Add a series, such as a rolling mean or the normals, to draw over the datasets."""
+        self.overlays.append({"dates": dates, "values": values, "label": label, "color": color, "linestyle": linestyle})
 
-        self._customize_plot(y_limit)
-        plt.show()
+    def add_highlight(  # pylint: disable=R0913
+        self,
+        dates: np.ndarray,
+        values: np.ndarray,
+        label: str,
+        color: str = "k",
+        marker: str = "o",
+    ) -> None:
+        """
+        Mark days, such as the ones found by a 'PercentileIndex', on the plot of the
+        last loaded dataset.
+        """
+        self.dataset["highlights"].append(
+            {"dates": dates, "values": values, "label": label, "color": color, "marker": marker}
+        )
 
-    def _make_plot(self, shade_between: bool) -> None:
+    def _plot_highlights(self) -> None:
+        """Plot the highlighted days of the dataset as markers."""
+        for highlight in self.dataset["highlights"]:
+            self.ax.scatter(
+                highlight["dates"],
+                highlight["values"],
+                color=highlight["color"],
+                marker=highlight["marker"],
+                s=16,
+                zorder=3,
+                label=highlight["label"],
+            )
+
+    def _plot_overlays(self) -> None:
+        """Plot the overlay series."""
+        for overlay in self.overlays:
+            self.ax.plot(
+                overlay["dates"],
+                overlay["values"],
+                color=overlay["color"],
+                linestyle=overlay["linestyle"],
+                linewidth=1,
+                label=overlay["label"],
+            )
+
+    def _make_plot(
+        self,
+        shade_between: bool,
+        downsample: Optional[Downsampling] = None,
+        gaps: Gaps = "break",
+    ) -> None:
         """Make the plot for the data of interest."""
+        weather_info_dict, weather_types, colors, alpha = self._select_weather_data()
+        dates, weather_info_dict = self._handle_gaps(weather_types, weather_info_dict, gaps)
+        dates, weather_info_dict = self._downsample(dates, weather_types, weather_info_dict, downsample)
+        self._plot_weather(dates, weather_types, weather_info_dict, colors, alpha, shade_between)
+        self._plot_highlights()
+
+    def _select_weather_data(self) -> tuple[dict[str, np.ndarray], list[str], list[str], float]:
+        """Return the weather data of the dataset, the weather types to plot and their colors."""
         weather_info_dict, highs, lows, precips, color, alpha = self._set_plot_variables()
 
         if self.dataset["high"] and self.dataset["low"]:
-            self._plot_weather([highs, lows], weather_info_dict, ["red", "blue"], alpha, shade_between)
+            weather_types: list[str] = [highs, lows]
+            colors: list[str] = ["red", "blue"]
         else:
             if self.dataset["high"] and not self.dataset["low"]:
-                weather_type: str = highs
+                weather_types = [highs]
             elif self.dataset["low"] and not self.dataset["high"]:
-                weather_type = lows
+                weather_types = [lows]
             elif self.dataset["precip"]:
-                weather_type = precips
-
-            self._plot_weather(
-                [weather_type],
-                weather_info_dict,
-                [color],
-                alpha,
-                shade_between,
-            )
+                weather_types = [precips]
+            else:
+                raise ValueError(
+                    f"Nothing to plot for {self.dataset['path']}: choose high, low or precip, "
+                    "the extra columns are loaded to be analyzed, not plotted."
+                )
+            colors = [color]
+
+        return weather_info_dict, weather_types, colors, alpha
+
+    def _handle_gaps(
+        self,
+        weather_types: list[str],
+        weather_info_dict: dict[str, np.ndarray],
+        gaps: Gaps,
+    ) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        """
+        Handle the missing values of the series: "break" leaves them as NaN, so the lines
+        break there, "interpolate" fills them linearly and "drop" removes their days.
+        """
+        dates: np.ndarray = self.dataset["dates"]
+        missing: np.ndarray = np.zeros(len(dates), dtype=bool)
+        for weather_type in weather_types:
+            missing |= np.isnan(weather_info_dict[weather_type])
+        if gaps == "break" or not missing.any():
+            return dates, weather_info_dict
+
+        if gaps == "drop":
+            kept: np.ndarray = ~missing
+            return dates[kept], {weather_type: weather_info_dict[weather_type][kept] for weather_type in weather_types}
+
+        days: np.ndarray = dates.astype(np.int64)
+        filled_info_dict: dict[str, np.ndarray] = {}
+        for weather_type in weather_types:
+            values: np.ndarray = weather_info_dict[weather_type]
+            valid: np.ndarray = ~np.isnan(values)
+            if valid.any():
+                values = np.interp(days, days[valid], values[valid]).astype(values.dtype)
+            filled_info_dict[weather_type] = values
+        return dates, filled_info_dict
+
+    def _downsample(
+        self,
+        dates: np.ndarray,
+        weather_types: list[str],
+        weather_info_dict: dict[str, np.ndarray],
+        downsample: Optional[Downsampling],
+        ax: Optional["Axes"] = None,
+    ) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        """
+        Reduce the series to about one point per pixel of the axes width.
+        The series share the kept dates, so the lines and the shaded area still match.
+        """
+        n_buckets: int = int((ax or self.ax).get_window_extent().width)
+        if downsample is None or len(dates) <= 2 * n_buckets:
+            return dates, weather_info_dict
+
+        select_indices: Callable[[np.ndarray, np.ndarray, int], np.ndarray] = (
+            _lttb_indices if downsample == "lttb" else _minmax_indices
+        )
+        indices_list: list[np.ndarray] = []
+        for weather_type in weather_types:
+            values: np.ndarray = weather_info_dict[weather_type]
+            indices_list.append(select_indices(dates, values, n_buckets))
+            # Keep the first missing value of each gap, so the lines still break there.
+            missing: np.ndarray = np.isnan(values)
+            indices_list.append(np.flatnonzero(missing & ~np.roll(missing, 1)))
+
+        indices: np.ndarray = np.unique(np.concatenate(indices_list))
+        return dates[indices], {
+            weather_type: weather_info_dict[weather_type][indices] for weather_type in weather_types
+        }
 
     def _set_plot_variables(
         self,
-    ) -> tuple[dict[str, list[float]], str, str, str, str, float]:
+    ) -> tuple[dict[str, np.ndarray], str, str, str, str, float]:
         """Store the variables needed to make the plot."""
         # Set a variable for the dictionary of the weather data.
-        weather_info_dict: dict[str, list[float]] = self.dataset["weather_info"]
-        # List the keys of the weather data dictionary. Used with the
-        #   variable above to determine which specific weather data to plot.
-        weather_info_dict_keys: list[str] = list(weather_info_dict.keys())
-        highs: str = weather_info_dict_keys[0]
-        lows: str = weather_info_dict_keys[1]
-        precips: str = weather_info_dict_keys[2]
+        weather_info_dict: dict[str, np.ndarray] = self.dataset["weather_info"]
+        # The names of the weather data columns. Used with the variable
+        #   above to determine which specific weather data to plot.
+        highs, lows, precips = WEATHER_TYPES
         color: str = self.dataset["color"]
         alpha: float = self.dataset["alpha"]
 
@@ -272,39 +1182,43 @@ class WeatherDataPlotter:
 
     def _plot_weather(  # pylint: disable=R0913
         self,
+        dates: np.ndarray,
         weather_types: list[str],
-        weather_info_dict: dict[str, list[float]],
+        weather_info_dict: dict[str, np.ndarray],
         colors: list[str],
         alpha: float,
         shade_between: bool,
     ) -> None:
         """Plot the weather data and shade between them if desired."""
         for weather_type, color in zip(weather_types, colors):
-            self._plot_weather_data(weather_type, weather_info_dict[weather_type], color, alpha)
+            self._plot_weather_data(dates, weather_type, weather_info_dict[weather_type], color, alpha)
         if shade_between:
             if len(weather_types) == 2:
                 self._fill_between(
+                    dates,
                     weather_info_dict[weather_types[0]],
                     weather_info_dict[weather_types[1]],
                     facecolor="blue",
                 )
             elif len(weather_types) == 1:
                 self._fill_between(
+                    dates,
                     weather_info_dict[weather_types[0]],
-                    weather_info_list_2=[0],
+                    weather_info_list_2=0.0,
                     facecolor=colors[0],
                 )
 
-    def _plot_weather_data(
+    def _plot_weather_data(  # pylint: disable=R0913
         self,
+        dates: np.ndarray,
         weather_type: str,
-        weather_info_list: list[float],
+        weather_info_list: np.ndarray,
         color: str,
         alpha: float,
     ) -> None:
         """Plot the weather data."""
         self.ax.plot(
-            self.dataset["dates"],
+            dates,
             weather_info_list,
             color=color,
             alpha=alpha,
@@ -313,15 +1227,16 @@ class WeatherDataPlotter:
 
     def _fill_between(
         self,
-        weather_info_list_1: list[float],
-        weather_info_list_2: list[float],
+        dates: np.ndarray,
+        weather_info_list_1: np.ndarray,
+        weather_info_list_2: Union[np.ndarray, float],
         facecolor: str,
     ) -> None:
         """Fill the area inside the weather data."""
         self.ax.fill_between(
-            self.dataset["dates"],
-            y1=weather_info_list_1,  # type: ignore
-            y2=weather_info_list_2,  # type: ignore
+            dates,
+            y1=weather_info_list_1,
+            y2=weather_info_list_2,
             facecolor=facecolor,
             alpha=0.3,
         )
@@ -340,15 +1255,19 @@ class WeatherDataPlotter:
         title += f"\n{formatted_name}"
         self.ax.set_title(title, color=self.title_color, fontsize=FONT_SIZE_TITLE)
 
-    def _format_plot_title(self) -> str:
+    def _format_plot_title(self, datasets: Optional[list[WeatherDataset]] = None) -> str:
         """Return a neatly formatted string of the location name for the title."""
-        loc_names: list[list[str]] = [dataset["loc_name"].split(", ") for dataset in self.datasets]
+        if datasets is None:
+            datasets = self.datasets
+        loc_names: list[list[str]] = [dataset["loc_name"].split(", ") for dataset in datasets]
         formatted_names: list[str] = [f"{loc[0].title()}, {loc[1]}" for loc in loc_names]
         formatted_name: str = "\n".join(formatted_names)
         return formatted_name
 
     def _customize_x_axis(self) -> None:
         """Customize the x axis."""
+        import matplotlib.dates as mdates  # pylint: disable=C0415
+
         self.ax.set_xlabel("", fontsize=FONT_SIZE_LABELS)
         # Display the dates at intervals of 1 month.
         self.ax.xaxis.set_major_locator(mdates.MonthLocator(interval=1))
@@ -378,3 +1297,100 @@ class WeatherDataPlotter:
         self.ax.grid(True, linestyle="--")
         self.ax.tick_params(labelsize=FONT_SIZE_TICKS)
         self.ax.legend(loc="upper left", fontsize=FONT_SIZE_LEGEND)
+
+
+# The plotter used by each worker process of weather_datasets to load the stations.
+_station_loader: Optional[WeatherDataPlotter] = None
+
+
+def _init_station_loader(cache: Optional[WeatherCache]) -> None:
+    """Make the plotter of the worker process. It's reused for all the stations it loads."""
+    global _station_loader  # pylint: disable=W0603
+    _station_loader = WeatherDataPlotter(cache=cache)
+
+
+def _load_station(spec: StationSpec) -> tuple[Optional[WeatherDataset], str]:
+    """Load the dataset of a station spec in a worker process."""
+    # Disabling pylint warning for accessing protected members.
+    return _station_loader._load_station(spec)  # type: ignore  # pylint: disable=W0212
+
+
+def render_charts(
+    jobs: list[RenderJob],
+    workers: Optional[int] = None,
+    cache: Optional[WeatherCache] = None,
+) -> dict[Path, str]:
+    """
+    Render a batch of charts to files without a display. The figures aren't managed
+    by pyplot, so the matplotlib backend of the caller is left untouched.
+
+    The jobs are split between a pool of worker processes. Each process reuses one
+    figure for all the charts it renders. Return the errors of the charts that
+    couldn't be rendered, keyed on their save_path.
+    """
+    if workers is None:
+        workers = min(len(jobs), os.cpu_count() or 1)
+
+    if workers <= 1:
+        renderer: WeatherDataPlotter = WeatherDataPlotter(cache=cache, headless=True)
+        results: list[tuple[Path, str]] = [_render_chart(job, renderer) for job in jobs]
+    else:
+        chunk_size: int = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(workers, initializer=_init_chart_renderer, initargs=(cache,)) as executor:
+            results = list(executor.map(_render_chart, jobs, chunksize=chunk_size))
+
+    render_errors: dict[Path, str] = {save_path: error for save_path, error in results if error}
+    for save_path, error in render_errors.items():
+        logging.error("Could not render %s: %s", save_path, error)
+    return render_errors
+
+
+# The plotter used by each worker process of render_charts. Its figure is reused for every chart.
+_chart_renderer: Optional[WeatherDataPlotter] = None
+
+
+def _init_chart_renderer(cache: Optional[WeatherCache]) -> None:
+    """Make the headless plotter of the worker process."""
+    global _chart_renderer  # pylint: disable=W0603
+    _chart_renderer = WeatherDataPlotter(cache=cache, headless=True)
+
+
+def _render_chart(job: RenderJob, renderer: Optional[WeatherDataPlotter] = None) -> tuple[Path, str]:
+    """
+    Render the chart of a job to its file with the renderer, by default the plotter
+    of the worker process. Return the error message if it can't be rendered.
+    """
+    try:
+        return job["save_path"], _render_job(job, renderer or _chart_renderer)  # type: ignore
+    # Any failure of a chart (loading, plotting, saving...) is reported without stopping the others.
+    except Exception as err:  # pylint: disable=W0718
+        return job["save_path"], f"{type(err).__name__}: {err}"
+
+
+def _render_job(job: RenderJob, renderer: WeatherDataPlotter) -> str:
+    """Render the chart of a job to its file. Return the load errors if no station could be loaded."""
+    renderer.clear_plot(job.get("title", ""), job.get("title_color", "k"))
+    renderer.weather_datasets(job["stations"], workers=1)
+    if not renderer.datasets:
+        return "; ".join(renderer.load_errors.values())
+
+    if job.get("grid", False):
+        renderer.plot_grid(
+            job.get("n_cols"),
+            job.get("shade_between", True),
+            job.get("y_limit"),
+            job["save_path"],
+            job.get("downsample"),
+            job.get("gaps", "break"),
+        )
+        # A grid has its own figure, sized for its stations, so it isn't reused.
+        renderer.grid_fig = None
+    else:
+        renderer.plot_visual(
+            job.get("shade_between", True),
+            job.get("y_limit"),
+            job["save_path"],
+            job.get("downsample"),
+            job.get("gaps", "break"),
+        )
+    return ""
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+
+"""
+This module defines the 'PercentileIndex' class to find the extreme days of the weather
+series loaded by the 'WeatherDataPlotter' class, compared to the same calendar day.
+
+The class allows to:
+- Sort the values of a series by day of year once, so each calendar day is a sorted run.
+- Find the days above or below a percentile of their calendar day in O(result) time.
+- Find the days with the largest anomalies and the record days of each calendar day.
+- Persist the index in a 'WeatherCache', next to the parsed dataset.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from weather_cache import WeatherCache
+from weather_data_plotter import WeatherDataset
+from weather_statistics import DAYS_IN_LEAP_YEAR, day_of_year
+
+INDEX_ARRAYS: tuple[str, ...] = ("dates", "order", "sorted_values", "day_starts", "anomaly_order", "sorted_anomalies")
+
+
+def _gather(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Return the concatenation of the ranges [start, end) in one vectorized step."""
+    lengths: np.ndarray = np.maximum(ends - starts, 0)
+    offsets: np.ndarray = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return np.arange(lengths.sum()) + offsets
+
+
+class PercentileIndex:
+    """Answer threshold, anomaly and record queries on a weather series by calendar day."""
+
+    def __init__(self, dates: np.ndarray, values: np.ndarray) -> None:
+        """Build the index of the series. Missing values are left out."""
+        valid: np.ndarray = ~np.isnan(values)
+        self.dates: np.ndarray = dates[valid].astype("datetime64[D]")
+        values = values[valid].astype(np.float64)
+        days: np.ndarray = day_of_year(self.dates)
+
+        # The values sorted by day of year, then by value, and where each day of year starts.
+        self.order: np.ndarray = np.lexsort((values, days))
+        self.sorted_values: np.ndarray = values[self.order]
+        self.day_starts: np.ndarray = np.searchsorted(days[self.order], np.arange(DAYS_IN_LEAP_YEAR + 1))
+
+        # The anomalies from the mean of each day of year, sorted.
+        sizes: np.ndarray = np.diff(self.day_starts)
+        sums: np.ndarray = np.bincount(days, weights=values, minlength=DAYS_IN_LEAP_YEAR)
+        normals: np.ndarray = np.divide(sums, sizes, out=np.zeros(DAYS_IN_LEAP_YEAR), where=sizes > 0)
+        anomalies: np.ndarray = values - normals[days]
+        self.anomaly_order: np.ndarray = np.argsort(anomalies, kind="stable")
+        self.sorted_anomalies: np.ndarray = anomalies[self.anomaly_order]
+
+    @classmethod
+    def from_dataset(
+        cls,
+        dataset: WeatherDataset,
+        weather_type: str = "highs",
+        cache: Optional[WeatherCache] = None,
+    ) -> "PercentileIndex":
+        """
+        Make the index of a weather type of a dataset loaded by the WeatherDataPlotter.
+        If a cache is given, the index is loaded from it, or built once and stored in it.
+        """
+        if cache is None:
+            return cls(dataset["dates"], dataset["weather_info"][weather_type])
+
+        key: str = cache.cache_key(dataset["path"], cls._key_columns(dataset, weather_type))
+        arrays: Optional[dict[str, np.ndarray]] = cache.load(key)
+        if arrays is not None:
+            return cls.from_arrays(arrays)
+
+        percentile_index: PercentileIndex = cls(dataset["dates"], dataset["weather_info"][weather_type])
+        cache.store(key, percentile_index.to_arrays())
+        return percentile_index
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray]) -> "PercentileIndex":
+        """Make the index from the arrays of to_arrays, without sorting the values again."""
+        percentile_index: PercentileIndex = cls.__new__(cls)
+        for name in INDEX_ARRAYS:
+            setattr(percentile_index, name, arrays[name])
+        return percentile_index
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Return the arrays of the index, to store them."""
+        return {name: getattr(self, name) for name in INDEX_ARRAYS}
+
+    @staticmethod
+    def _key_columns(dataset: WeatherDataset, weather_type: str) -> dict[str, object]:
+        """Return what identifies the index of the dataset, besides its file."""
+        dates: np.ndarray = dataset["dates"]
+        return {
+            "percentile_index": weather_type,
+            "float32": dataset["float32"],
+            "first_date": str(dates[0]) if len(dates) else "",
+            "last_date": str(dates[-1]) if len(dates) else "",
+            "n_dates": len(dates),
+            "stations": list(dataset["stations"]),
+            "temp_scale": dataset["temp_scale"],
+            "precip_scale": dataset["precip_scale"],
+        }
+
+    def thresholds(self, percentile: float) -> np.ndarray:
+        """Return the percentile of each calendar day (0-365), NaN for days without data."""
+        starts: np.ndarray = self.day_starts[:-1]
+        sizes: np.ndarray = np.diff(self.day_starts)
+        # The linear interpolation between the closest ranks, as np.percentile does.
+        positions: np.ndarray = np.maximum(sizes - 1, 0) * percentile / 100
+        lower: np.ndarray = np.floor(positions).astype(np.int64)
+        upper: np.ndarray = np.minimum(lower + 1, np.maximum(sizes - 1, 0))
+        fractions: np.ndarray = positions - lower
+
+        thresholds: np.ndarray = np.full(DAYS_IN_LEAP_YEAR, np.nan)
+        has_data: np.ndarray = sizes > 0
+        lower_values: np.ndarray = self.sorted_values[(starts + lower)[has_data]]
+        upper_values: np.ndarray = self.sorted_values[(starts + upper)[has_data]]
+        thresholds[has_data] = lower_values + fractions[has_data] * (upper_values - lower_values)
+        return thresholds
+
+    def beyond_percentile(self, percentile: float, above: bool = True) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the days (and their values) above the percentile of their calendar day,
+        or below it if above is False. Each calendar day is a sorted run, so only the
+        boundary of each run is searched and the rest of the time goes to the result.
+        """
+        thresholds: np.ndarray = self.thresholds(percentile)
+        starts: np.ndarray = self.day_starts[:-1]
+        ends: np.ndarray = self.day_starts[1:]
+        boundaries: np.ndarray = starts.copy()
+        for day in np.flatnonzero(ends > starts):
+            run: np.ndarray = self.sorted_values[starts[day] : ends[day]]
+            boundaries[day] += np.searchsorted(run, thresholds[day], side="right" if above else "left")
+
+        sorted_positions: np.ndarray = _gather(boundaries, ends) if above else _gather(starts, boundaries)
+        return self._days(self.order[sorted_positions], self.sorted_values[sorted_positions])
+
+    def anomalies(self, delta: float, above: bool = True) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the days (and their anomalies) more than delta above the mean of their
+        calendar day, or more than delta below it if above is False.
+        """
+        if above:
+            sorted_positions: np.ndarray = np.arange(
+                np.searchsorted(self.sorted_anomalies, delta, side="right"), len(self.sorted_anomalies)
+            )
+        else:
+            sorted_positions = np.arange(np.searchsorted(self.sorted_anomalies, -delta, side="left"))
+        return self._days(self.anomaly_order[sorted_positions], self.sorted_anomalies[sorted_positions])
+
+    def records(self, highest: bool = True) -> tuple[np.ndarray, np.ndarray]:
+        """Return the record day (and its value) of each calendar day, highest or lowest."""
+        starts: np.ndarray = self.day_starts[:-1]
+        ends: np.ndarray = self.day_starts[1:]
+        has_data: np.ndarray = ends > starts
+        sorted_positions: np.ndarray = (ends - 1)[has_data] if highest else starts[has_data]
+        return self._days(self.order[sorted_positions], self.sorted_values[sorted_positions])
+
+    def _days(self, positions: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return the dates of the positions and their values, in date order."""
+        date_order: np.ndarray = np.argsort(positions, kind="stable")
+        return self.dates[positions[date_order]], values[date_order]
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+
+"""
+This module defines the 'WeatherStatistics' class to compute climatology and rolling
+statistics of the weather series loaded by the 'WeatherDataPlotter' class.
+
+The class allows to:
+- Compute rolling means, monthly and yearly means and day-of-year normals with NumPy.
+- Update all the statistics incrementally when new days of data are appended.
+- Return the statistics as (dates, values) series that can be plotted as overlays.
+"""
+
+from typing import Union
+
+import numpy as np
+
+from weather_data_plotter import WeatherDataset
+
+DAYS_IN_LEAP_YEAR: int = 366
+# The day of year of March 1 in a leap year. Later days of common years are shifted
+#   by one, so every calendar day keeps the same slot in the normals.
+MARCH_FIRST: int = 59
+
+
+def day_of_year(dates: np.ndarray) -> np.ndarray:
+    """Return the day of year of the dates (0-365), using the calendar of a leap year."""
+    dates = dates.astype("datetime64[D]")
+    years: np.ndarray = dates.astype("datetime64[Y]")
+    days: np.ndarray = (dates - years.astype("datetime64[D]")).astype(np.int64)
+    year_numbers: np.ndarray = years.astype(np.int64) + 1970
+    is_leap: np.ndarray = (year_numbers % 4 == 0) & ((year_numbers % 100 != 0) | (year_numbers % 400 == 0))
+    return days + ((days >= MARCH_FIRST) & ~is_leap)
+
+
+def _grow(array: np.ndarray, size: int) -> np.ndarray:
+    """Return the array with room for at least size items, doubling its capacity when needed."""
+    if size <= len(array):
+        return array
+    grown: np.ndarray = np.zeros(max(size, 2 * len(array)), dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+class WeatherStatistics:  # pylint: disable=R0902
+    """Compute and incrementally update the statistics of a weather series."""
+
+    def __init__(self, window: int = 7) -> None:
+        """Initialize the statistics attributes."""
+        self.window = window
+        self.size: int = 0
+        self._dates: np.ndarray = np.zeros(0, dtype="datetime64[D]")
+        # The cumulative sums and counts of the valid values, used for the rolling mean.
+        self._cumulative_sums: np.ndarray = np.zeros(1)
+        self._cumulative_counts: np.ndarray = np.zeros(1, dtype=np.int64)
+        # The sums and counts of the months and years, from the first month and year of the series.
+        self._first_month: int = 0
+        self._first_year: int = 0
+        self._n_months: int = 0
+        self._n_years: int = 0
+        self._month_sums: np.ndarray = np.zeros(0)
+        self._month_counts: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._year_sums: np.ndarray = np.zeros(0)
+        self._year_counts: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._doy_sums: np.ndarray = np.zeros(DAYS_IN_LEAP_YEAR)
+        self._doy_counts: np.ndarray = np.zeros(DAYS_IN_LEAP_YEAR, dtype=np.int64)
+
+    @classmethod
+    def from_dataset(cls, dataset: WeatherDataset, weather_type: str = "highs", window: int = 7) -> "WeatherStatistics":
+        """Make the statistics of a weather type of a dataset loaded by the WeatherDataPlotter."""
+        statistics: WeatherStatistics = cls(window)
+        statistics.extend(dataset["dates"], dataset["weather_info"][weather_type])
+        return statistics
+
+    def append(self, date: Union[np.datetime64, str], value: float) -> None:
+        """Add a new day of data, updating the statistics without recomputing them."""
+        self.extend(np.array([date], dtype="datetime64[D]"), np.array([value], dtype=np.float64))
+
+    def extend(self, dates: np.ndarray, values: np.ndarray) -> None:
+        """
+        Add new days of data, after the ones already added. Only the new days are
+        processed, the statistics of the previous ones are updated in place.
+        Raise ValueError if the dates are not sorted or don't follow the last added day.
+        """
+        if dates.size == 0:
+            return
+        dates = dates.astype("datetime64[D]")
+        if np.any(dates[1:] < dates[:-1]):
+            raise ValueError("The dates must be sorted in increasing order.")
+        if self.size and dates[0] <= self._dates[self.size - 1]:
+            raise ValueError(f"The dates must start after {self._dates[self.size - 1]}, the last added day.")
+        values = values.astype(np.float64)
+        valid: np.ndarray = ~np.isnan(values)
+        valid_values: np.ndarray = np.where(valid, values, 0.0)
+
+        if self.size == 0:
+            self._first_month = int(dates[0].astype("datetime64[M]").astype(np.int64))
+            self._first_year = int(dates[0].astype("datetime64[Y]").astype(np.int64))
+
+        self._extend_cumulative(dates, valid_values, valid)
+        self._extend_calendar_bins(dates, valid_values, valid)
+
+    def _extend_cumulative(self, dates: np.ndarray, valid_values: np.ndarray, valid: np.ndarray) -> None:
+        """Append the new days to the dates and to the cumulative sums and counts."""
+        new_size: int = self.size + len(dates)
+        self._dates = _grow(self._dates, new_size)
+        self._cumulative_sums = _grow(self._cumulative_sums, new_size + 1)
+        self._cumulative_counts = _grow(self._cumulative_counts, new_size + 1)
+
+        self._dates[self.size : new_size] = dates
+        self._cumulative_sums[self.size + 1 : new_size + 1] = self._cumulative_sums[self.size] + np.cumsum(valid_values)
+        self._cumulative_counts[self.size + 1 : new_size + 1] = self._cumulative_counts[self.size] + np.cumsum(valid)
+        self.size = new_size
+
+    def _extend_calendar_bins(self, dates: np.ndarray, valid_values: np.ndarray, valid: np.ndarray) -> None:
+        """Add the new days to the sums and counts of their months, years and days of year."""
+        months: np.ndarray = dates.astype("datetime64[M]").astype(np.int64) - self._first_month
+        years: np.ndarray = dates.astype("datetime64[Y]").astype(np.int64) - self._first_year
+        self._n_months = max(self._n_months, int(months.max()) + 1)
+        self._n_years = max(self._n_years, int(years.max()) + 1)
+
+        self._month_sums = _grow(self._month_sums, self._n_months)
+        self._month_counts = _grow(self._month_counts, self._n_months)
+        self._year_sums = _grow(self._year_sums, self._n_years)
+        self._year_counts = _grow(self._year_counts, self._n_years)
+
+        for sums, counts, bins in [
+            (self._month_sums, self._month_counts, months),
+            (self._year_sums, self._year_counts, years),
+            (self._doy_sums, self._doy_counts, day_of_year(dates)),
+        ]:
+            np.add.at(sums, bins, valid_values)
+            np.add.at(counts, bins, valid)
+
+    def rolling_mean(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return the mean of the last window days for each day. Missing values are skipped."""
+        ends: np.ndarray = np.arange(1, self.size + 1)
+        starts: np.ndarray = np.maximum(ends - self.window, 0)
+        sums: np.ndarray = self._cumulative_sums[ends] - self._cumulative_sums[starts]
+        counts: np.ndarray = self._cumulative_counts[ends] - self._cumulative_counts[starts]
+        return self._dates[: self.size], self._means(sums, counts)
+
+    def monthly_means(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return the mean of each month, dated on the first day of the month."""
+        months: np.ndarray = (np.arange(self._n_months) + self._first_month).astype("datetime64[M]")
+        means: np.ndarray = self._means(self._month_sums[: self._n_months], self._month_counts[: self._n_months])
+        return months.astype("datetime64[D]"), means
+
+    def yearly_means(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return the mean of each year, dated on the first day of the year."""
+        years: np.ndarray = (np.arange(self._n_years) + self._first_year).astype("datetime64[Y]")
+        means: np.ndarray = self._means(self._year_sums[: self._n_years], self._year_counts[: self._n_years])
+        return years.astype("datetime64[D]"), means
+
+    def normals(self) -> np.ndarray:
+        """Return the mean of each calendar day (0-365) across all the years."""
+        return self._means(self._doy_sums, self._doy_counts)
+
+    def normals_series(self, dates: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return the normal of each of the dates, to plot it next to the series."""
+        return dates, self.normals()[day_of_year(dates)]
+
+    @staticmethod
+    def _means(sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Divide the sums by the counts. Bins without valid values are NaN."""
+        means: np.ndarray = np.full(len(sums), np.nan)
+        np.divide(sums, counts, out=means, where=counts > 0)
+        return means
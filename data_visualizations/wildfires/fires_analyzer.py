@@ -6,15 +6,29 @@ in North America (July 12, 2024 to July 14, 2024).
 
 It reads data from a CSV file, formats the dates and times,
 and creates a geographical scatter plot to visualize wildfire locations
-and brightness using Plotly.
+and brightness using Plotly. The plot can also be exported as a compact
+HTML or JSON file, with the numeric data encoded as typed arrays.
 """
 
-from datetime import datetime
+import sys
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 
+# figure_export is shared with the earthquakes project, it's imported from the parent directory.
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import figure_export  # pylint: disable=C0413,C0411,E0401
+
+# The hover label of each wildfire, filled in by plotly.js from the data of the point.
+HOVER_TEMPLATE: str = (
+    "(%{lat}, %{lon})<br>"
+    "Acquisition Date: %{customdata|%B %d, %Y -- %H:%M (24 HR Format)} -- Brightness: %{marker.color}"
+    "<extra></extra>"
+)
+TITLE_DATE_FORMAT: str = "%B %d, %Y"
+
 
 class WildfirePlotter:
     """A class to visualize wildfire activity in North America."""
@@ -22,8 +36,7 @@ class WildfirePlotter:
     def __init__(self, path: str) -> None:
         """Initialize the class attributes, read the csv file and plot the data."""
         self.path = path
-        self.acq_times: list[str] = []
-        self.acq_dates: list[str] = []
+        self.acq_datetimes: np.ndarray = np.empty(0, dtype="datetime64[ms]")
         self.fires_data: pd.DataFrame = pd.DataFrame()
 
     def read_file(self) -> None:
@@ -32,21 +45,32 @@ class WildfirePlotter:
 
     def visualize_plot(self) -> None:
         """Visualize wildfire activity."""
-        self._format_label_text()
+        fig: go.Figure = self.fires_figure()
+        fig.show(renderer="browser")
+
+    def export_plot(self, path: Path, shared_plotlyjs: bool = False, float32: bool = False) -> None:
+        """Write the plot as compact HTML, or JSON if the path ends in .json (see figure_export)."""
+        figure_export.export_figure(self.fires_figure(), path, shared_plotlyjs, float32)
+
+    def fires_figure(self) -> go.Figure:
+        """Make the figure of the wildfire activity."""
+        self._format_acquisition_times()
         # Lower the brightness value to use it as a size in the plot.
-        bright_size: list[int] = [bright // 18 for bright in self.fires_data["brightness"]]
+        bright_size: np.ndarray = (self.fires_data["brightness"] // 18).to_numpy()
 
-        # Make the plot.
+        # Make the plot. The hover labels are formatted by plotly.js from the times and brightness,
+        #   so no label string is stored per wildfire.
         fig = go.Figure(
             data=go.Scattergeo(
-                lat=self.fires_data["latitude"],
-                lon=self.fires_data["longitude"],
-                text=self.fires_data["text"],
+                lat=self.fires_data["latitude"].to_numpy(),
+                lon=self.fires_data["longitude"].to_numpy(),
+                customdata=self.acq_datetimes,
+                hovertemplate=HOVER_TEMPLATE,
                 mode="markers",
                 marker={
                     "size": bright_size,
                     "symbol": "star-triangle-up",
-                    "color": self.fires_data["brightness"],
+                    "color": self.fires_data["brightness"].to_numpy(),
                     "colorscale": "Hot",
                     "colorbar_title": "Wildfire Brightness",
                 },
@@ -54,45 +78,22 @@ class WildfirePlotter:
         )
 
         self._update_plot(fig)
-        fig.show(renderer="browser")
-
-    def _format_label_text(self) -> None:
-        """Combine the date, time and brightness into a text for the plot label."""
-        self._format_date()
-        self._format_time()
-
-        self.fires_data["text"] = [
-            f"Acquisition Date: {date} -- {time} -- Brightness: {brightness}"
-            for date, time, brightness in zip(
-                self.acq_dates,
-                self.acq_times,
-                self.fires_data["brightness"].astype(str),
-            )
-        ]
-
-    def _format_date(self) -> None:
-        """Format the data acquisition date to neatly display it."""
-        df_dates: list[str] = list(self.fires_data["acq_date"])
-
-        for df_date in df_dates:
-            datetime_date: datetime = datetime.strptime(df_date, "%Y-%m-%d")
-            formatted_date: str = datetime_date.strftime("%B %d, %Y")
-            self.acq_dates.append(formatted_date)
-
-    def _format_time(self) -> None:
-        """Format the data acquisition time to neatly display it."""
-        df_times: list[str] = list(self.fires_data["acq_time"])
-
-        for df_time in df_times:
-            time_str: str = str(df_time).zfill(4)
-            datetime_time: datetime = datetime.strptime(time_str, "%H%M")
-            formatted_time: str = datetime_time.strftime("%H:%M (24 HR Format)")
-            self.acq_times.append(formatted_time)
+        return fig
+
+    def _format_acquisition_times(self) -> None:
+        """Combine the acquisition dates and times (such as 226 for 02:26) into datetimes."""
+        acq_dates: pd.Series = pd.to_datetime(self.fires_data["acq_date"], format="%Y-%m-%d")
+        acq_times: pd.Series = self.fires_data["acq_time"].astype(int)
+        acq_datetimes: pd.Series = (
+            acq_dates + pd.to_timedelta(acq_times // 100, unit="h") + pd.to_timedelta(acq_times % 100, unit="min")
+        )
+        self.acq_datetimes = acq_datetimes.to_numpy(dtype="datetime64[ms]")
 
     def _update_plot(self, fig: go.Figure) -> None:
         """Customize the plot."""
+        first_date, last_date = pd.DatetimeIndex(self.acq_datetimes[[0, -1]]).strftime(TITLE_DATE_FORMAT)
         title: str = "USA Contiguous and Hawaii Wildfire Activity "
-        title += f"({self.acq_dates[0]} to {self.acq_dates[-1]})"
+        title += f"({first_date} to {last_date})"
 
         fig.update_layout(
             geo={
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+"""This module tests the 'WildfirePlotter' class to ensure it works as expected."""
+
+from pathlib import Path
+from typing import Any
+import json
+import pytest
+import numpy as np
+
+from fires_analyzer import WildfirePlotter as WP, figure_export
+
+
+@pytest.fixture(name="wildfire")
+def wildfire_fixture() -> WP:
+    """An instance of the wildfire class with the data read, available for all tests."""
+    wildfire: WP = WP(Path("fires_file", "MODIS_C6_1_USA_contiguous_and_Hawaii_3d.csv"))
+    wildfire.read_file()
+    return wildfire
+
+
+def test_acquisition_times(tmp_path: Path) -> None:
+    """Test if the acquisition times are split in hours and minutes (such as 226 for 02:26)."""
+    path: Path = tmp_path / "fires.csv"
+    path.write_text(
+        "latitude,longitude,brightness,acq_date,acq_time\n"
+        "38.9,-78.3,301.5,2024-07-12,0226\n"
+        "40.0,-75.1,307.7,2024-07-13,1405\n"
+        "21.3,-157.8,320.1,2024-07-14,5\n",
+        encoding="utf-8",
+    )
+    wildfire: WP = WP(str(path))
+    wildfire.read_file()
+    fig = wildfire.fires_figure()
+
+    expected: np.ndarray = np.array(
+        ["2024-07-12T02:26", "2024-07-13T14:05", "2024-07-14T00:05"], dtype="datetime64[ms]"
+    )
+    assert (wildfire.acq_datetimes == expected).all()
+    assert fig.layout.title.text.endswith("(July 12, 2024 to July 14, 2024)")
+
+
+def test_plot_exported_compact(wildfire: WP, tmp_path: Path) -> None:
+    """Test if the plot is exported with typed arrays and the dates of the hover labels as ISO strings."""
+    wildfire.export_plot(tmp_path / "fires.json", float32=True)
+    trace: dict[str, Any] = json.loads((tmp_path / "fires.json").read_text(encoding="utf-8"))["data"][0]
+
+    assert trace["lat"]["dtype"] == "f4"
+    assert np.allclose(figure_export.decode_typed_array(trace["lat"]), wildfire.fires_data["latitude"])
+    assert np.allclose(figure_export.decode_typed_array(trace["marker"]["color"]), wildfire.fires_data["brightness"])
+    # The hover template formats the dates itself, so they must be exported as dates.
+    hover_times: np.ndarray = np.array(trace["customdata"], dtype="datetime64[ms]")
+    assert (hover_times == wildfire.acq_datetimes).all()
+    assert "%{customdata|%B %d, %Y -- %H:%M" in trace["hovertemplate"]
+
+    for name in ("first_map.html", "second_map.html"):
+        wildfire.export_plot(tmp_path / "maps" / name, shared_plotlyjs=True)
+    assert sorted(path.name for path in (tmp_path / "maps").iterdir()) == [
+        "first_map.html",
+        "plotly.min.js",
+        "second_map.html",
+    ]